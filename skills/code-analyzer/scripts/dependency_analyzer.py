@@ -11,16 +11,33 @@
 
 import os
 import sys
+import io
 import json
 import re
 import logging
 import hashlib
+import bisect
+import functools
+import heapq
+from array import array
 from dataclasses import dataclass, field
 from typing import Dict, List, Optional, Tuple, Set, Any
 from pathlib import Path
-from enum import Enum
+from enum import Enum, IntEnum
 from collections import defaultdict, deque
-import graphviz
+from concurrent.futures import ProcessPoolExecutor
+
+try:
+    # google-re2 基于DFA，匹配时间与输入长度呈线性关系，不会出现灾难性回溯
+    import re2
+except ImportError:
+    re2 = None
+
+try:
+    # orjson 使用C实现的编码器，比标准库json的带缩进输出快数倍
+    import orjson
+except ImportError:
+    orjson = None
 
 # 配置日志记录器
 logging.basicConfig(
@@ -30,19 +47,59 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# 换行符模式，用于一次性计算文件内所有换行位置
+_NEWLINE_PATTERN = re.compile('\n')
+
+# Markdown 行内格式模式（加粗需先于斜体替换）
+_STRONG_PATTERN = re.compile(r'\*\*(.*?)\*\*')
+_EMPHASIS_PATTERN = re.compile(r'\*(.*?)\*')
+
+# 文件数达到该阈值时才启用多进程提取依赖，避免小项目承担进程启动开销
+_PARALLEL_MIN_FILES = 256
+
+
+class DependencyType(IntEnum):
+    """依赖类型枚举（整数取值，可直接参与比较、哈希和紧凑存储）"""
+    IMPORT = 0          # 导入依赖
+    INHERIT = 1         # 继承依赖
+    COMPOSITION = 2     # 组合依赖
+    AGGREGATION = 3     # 聚合依赖
+    ASSOCIATION = 4     # 关联依赖
+    CALL = 5            # 调用依赖
+    DATA_FLOW = 6       # 数据流依赖
+    CONFIG = 7          # 配置依赖
+    DATABASE = 8        # 数据库依赖
+    EXTERNAL = 9        # 外部依赖
+    
+    @property
+    def label(self) -> str:
+        """依赖类型的字符串标识（如 import、data_flow）"""
+        return self.name.lower()
+
 
-class DependencyType(Enum):
-    """依赖类型枚举"""
-    IMPORT = "import"           # 导入依赖
-    INHERIT = "inherit"         # 继承依赖
-    COMPOSITION = "composition"  # 组合依赖
-    AGGREGATION = "aggregation"  # 聚合依赖
-    ASSOCIATION = "association"  # 关联依赖
-    CALL = "call"               # 调用依赖
-    DATA_FLOW = "data_flow"     # 数据流依赖
-    CONFIG = "config"           # 配置依赖
-    DATABASE = "database"       # 数据库依赖
-    EXTERNAL = "external"       # 外部依赖
+# 按依赖类型整数值索引的字符串标识，避免逐条依赖解析枚举属性
+_DEP_TYPE_LABELS = tuple(t.label for t in DependencyType)
+
+
+def _json_dumps(obj: Any, depth: int = 0) -> str:
+    """
+    将对象序列化为带2空格缩进的JSON字符串
+    
+    安装了orjson时使用其C实现编码器，否则回退到标准库json，两者输出一致。
+    
+    Args:
+        obj: 待序列化对象
+        depth: 结果在外层文档中的嵌套层级，用于分段拼接时补齐续行缩进
+        
+    Returns:
+        JSON字符串
+    """
+    if orjson is not None:
+        text = orjson.dumps(obj, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS).decode('utf-8')
+    else:
+        text = json.dumps(obj, ensure_ascii=False, indent=2)
+    # JSON字符串内的换行均已转义，原始换行只会出现在结构缩进处
+    return text.replace('\n', '\n' + '  ' * depth) if depth else text
 
 
 class CouplingMetric(Enum):
@@ -54,7 +111,7 @@ class CouplingMetric(Enum):
     DISTANCE = "D"               # 距离主序列
 
 
-@dataclass
+@dataclass(slots=True)
 class Dependency:
     """依赖关系数据类"""
     source_module: str           # 源模块
@@ -67,7 +124,7 @@ class Dependency:
     description: str = ""        # 依赖描述
 
 
-@dataclass
+@dataclass(slots=True)
 class ModuleDependencyInfo:
     """模块依赖信息数据类"""
     module_name: str             # 模块名称
@@ -78,26 +135,205 @@ class ModuleDependencyInfo:
     abstraction: float = 0.0     # 抽象度
     distance: float = 0.0        # 到主序列的距离
     dependencies: List[Dependency] = field(default_factory=list)  # 出向依赖
-    dependents: List[Dependency] = field(default_factory=list)    # 入向依赖
+    dependent_sources: Set[str] = field(default_factory=set)      # 入向依赖的源模块
     core_classes: List[str] = field(default_factory=list)         # 核心类
     public_interfaces: List[str] = field(default_factory=list)    # 公共接口
     metrics: Dict[str, Any] = field(default_factory=dict)         # 其他指标
 
 
-@dataclass
+class EdgeTable:
+    """
+    依赖边表
+    
+    以并行数组（SoA）形式存储全部依赖边，模块名统一映射为整数ID，
+    遍历时只需扫描连续的基础类型数组，无需逐个访问 Dependency 对象的属性。
+    """
+    
+    def __init__(self):
+        """初始化依赖边表"""
+        self.module_id: Dict[str, int] = {}     # 模块名 -> 模块ID
+        self.module_names: List[str] = []       # 模块ID -> 模块名
+        self.source = array('i')                # 源模块ID
+        self.target = array('i')                # 目标模块ID
+        self.dep_type = array('B')              # 依赖类型（DependencyType 取值）
+        self.strength = array('d')              # 依赖强度
+        self.file_path: List[str] = []          # 依赖所在文件
+        self.line = array('i')                  # 依赖所在行号
+        self.element_name: List[str] = []       # 依赖的元素名称
+        self.description: List[str] = []        # 依赖描述
+        # 每个（源, 目标）模块对首次出现的边序号，渲染时无需再逐边去重
+        self.pair_edges = array('i')
+        self._pairs: Set[Tuple[int, int]] = set()
+    
+    def __len__(self) -> int:
+        return len(self.source)
+    
+    def __iter__(self):
+        for i in range(len(self.source)):
+            yield self.dependency(i)
+    
+    def intern(self, module_name: str) -> int:
+        """
+        获取模块ID，首次出现的模块分配新ID
+        
+        Args:
+            module_name: 模块名称
+            
+        Returns:
+            int: 模块ID
+        """
+        module_id = self.module_id.get(module_name)
+        if module_id is None:
+            module_id = len(self.module_names)
+            self.module_id[module_name] = module_id
+            self.module_names.append(module_name)
+        return module_id
+    
+    def append(self, dependency: Dependency):
+        """
+        追加一条依赖边
+        
+        Args:
+            dependency: 依赖关系
+        """
+        source = self.intern(dependency.source_module)
+        target = self.intern(dependency.target_module)
+        if (source, target) not in self._pairs:
+            self._pairs.add((source, target))
+            self.pair_edges.append(len(self.source))
+        
+        self.source.append(source)
+        self.target.append(target)
+        self.dep_type.append(dependency.dependency_type)
+        self.strength.append(dependency.strength)
+        self.file_path.append(dependency.file_path)
+        self.line.append(dependency.line_number)
+        self.element_name.append(dependency.element_name)
+        self.description.append(dependency.description)
+    
+    def dependency(self, i: int) -> Dependency:
+        """
+        将第 i 条边物化为 Dependency 对象
+        
+        Args:
+            i: 边序号
+            
+        Returns:
+            Dependency: 依赖关系
+        """
+        names = self.module_names
+        return Dependency(
+            source_module=names[self.source[i]],
+            target_module=names[self.target[i]],
+            dependency_type=DependencyType(self.dep_type[i]),
+            strength=self.strength[i],
+            file_path=self.file_path[i],
+            line_number=self.line[i],
+            element_name=self.element_name[i],
+            description=self.description[i]
+        )
+    
+    def adjacency(self) -> Tuple[array, array]:
+        """
+        构建 CSR 格式的邻接表
+        
+        Returns:
+            Tuple[array, array]: (indptr, indices)，模块 v 的后继为
+            indices[indptr[v]:indptr[v + 1]]
+        """
+        n = len(self.module_names)
+        indptr = array('i', bytes(4 * (n + 1)))
+        for src in self.source:
+            indptr[src + 1] += 1
+        for v in range(n):
+            indptr[v + 1] += indptr[v]
+        
+        indices = array('i', bytes(4 * len(self.source)))
+        fill = indptr[:-1]
+        for src, tgt in zip(self.source, self.target):
+            indices[fill[src]] = tgt
+            fill[src] += 1
+        
+        return indptr, indices
+
+
+@dataclass(slots=True)
 class DependencyGraph:
     """依赖图数据类"""
     nodes: Dict[str, ModuleDependencyInfo] = field(default_factory=dict)  # 节点
-    edges: List[Dependency] = field(default_factory=list)                  # 边
+    edge_table: EdgeTable = field(default_factory=EdgeTable)              # 边
     metadata: Dict[str, Any] = field(default_factory=dict)                # 元数据
+    version: int = 0                                                      # 结构版本号，每次变更时递增
+    csr: Optional[Tuple[array, array]] = None                            # CSR 邻接表缓存
+    
+    @property
+    def edges(self) -> List[Dependency]:
+        """依赖边列表，按需从边表物化"""
+        return list(self.edge_table)
+    
+    def add_edge(self, dependency: Dependency):
+        """
+        添加依赖边
+        
+        Args:
+            dependency: 依赖关系
+        """
+        self.edge_table.append(dependency)
+        self.version += 1
+        self.csr = None
+    
+    def get_dependents(self, module_name: str) -> List[Dependency]:
+        """
+        获取指向指定模块的全部入向依赖
+        
+        Args:
+            module_name: 模块名称
+            
+        Returns:
+            List[Dependency]: 以该模块为目标的依赖列表
+        """
+        table = self.edge_table
+        module_id = table.module_id.get(module_name)
+        if module_id is None:
+            return []
+        
+        return [
+            table.dependency(i)
+            for i, target in enumerate(table.target)
+            if target == module_id
+        ]
+    
+    def adjacency(self) -> Tuple[array, array]:
+        """
+        获取 CSR 格式的邻接表，图结构未变更时复用已构建的结果
+        
+        Returns:
+            Tuple[array, array]: (indptr, indices)
+        """
+        if self.csr is None:
+            self.csr = self.edge_table.adjacency()
+        return self.csr
 
 
 class DependencyExtractor:
     """依赖提取器，从源代码中提取依赖关系"""
     
-    def __init__(self):
-        """初始化依赖提取器"""
+    def __init__(self, use_re2: bool = True, enable_cache: bool = True):
+        """
+        初始化依赖提取器
+        
+        Args:
+            use_re2: 是否在可用时使用 RE2 引擎编译导入模式（未安装 google-re2 时回退到 re）
+            enable_cache: 是否按文件内容哈希缓存扫描结果
+        """
+        self.use_re2 = use_re2 and re2 is not None
+        self.enable_cache = enable_cache
+        # (语言, 内容哈希) -> [(行号, 模块名)]，与文件路径无关，可跨文件复用
+        self._cache: Dict[Tuple[str, bytes], List[Tuple[int, str]]] = {}
         self.import_patterns = {}
+        self.import_keywords = {}
+        self.compiled_patterns = {}
+        self.pattern_groups = {}
         self._init_patterns()
     
     def _init_patterns(self):
@@ -134,6 +370,50 @@ class DependencyExtractor:
                 r'import\s+=?\s*require\([\'"]([^\'"]+)[\'"]',
             ],
         }
+        
+        # 每种语言的导入模式都至少包含其中一个关键字，内容中一个都不出现时可跳过正则扫描
+        self.import_keywords = {
+            'python': ('import',),
+            'javascript': ('import', 'require'),
+            'java': ('import',),
+            'cpp': ('#include',),
+            'go': ('import',),
+            'rust': ('use', 'extern'),
+            'typescript': ('import', 'require'),
+        }
+        
+        # 将每种语言的多个模式合并为一个带命名组的交替式并预编译，
+        # 单次扫描即可得到全部导入，避免逐模式重复编译和多遍扫描
+        for language, patterns in self.import_patterns.items():
+            alternatives = []
+            groups = {}
+            offset = 0
+            for i, pattern in enumerate(patterns):
+                alternatives.append(f'(?P<p{i}>{pattern})')
+                inner_count = re.compile(pattern).groups
+                # 命名组名 -> (原始模式, 内部捕获组在 match.groups() 中的切片范围)
+                groups[f'p{i}'] = (pattern, offset + 1, offset + 1 + inner_count)
+                offset += 1 + inner_count
+            self.compiled_patterns[language] = self._compile('|'.join(alternatives))
+            self.pattern_groups[language] = groups
+    
+    def _compile(self, pattern: str):
+        """
+        编译正则模式
+        
+        导入模式均不含反向引用和环视，可直接交给 RE2 编译
+        
+        Args:
+            pattern: 正则模式
+            
+        Returns:
+            编译后的正则对象
+        """
+        if self.use_re2:
+            options = re2.Options()
+            options.max_mem = 8 << 20
+            return re2.compile(pattern, options)
+        return re.compile(pattern)
     
     def extract_dependencies(self, file_path: str, content: str, language: str) -> List[Dependency]:
         """
@@ -147,32 +427,76 @@ class DependencyExtractor:
         Returns:
             List[Dependency]: 依赖关系列表
         """
-        dependencies = []
+        language = language.lower()
+        if language not in self.compiled_patterns:
+            return []
+        
+        # 关键字预筛选：子串查找远快于正则扫描和内容哈希
+        if not any(keyword in content for keyword in self.import_keywords[language]):
+            return []
+        
+        if self.enable_cache:
+            digest = hashlib.blake2b(
+                content.encode('utf-8', 'surrogatepass'), digest_size=16
+            ).digest()
+            key = (language, digest)
+            imports = self._cache.get(key)
+            if imports is None:
+                imports = self._scan_imports(content, language)
+                self._cache[key] = imports
+        else:
+            imports = self._scan_imports(content, language)
         
-        patterns = self.import_patterns.get(language.lower(), [])
-        
-        for pattern in patterns:
-            for match in re.finditer(pattern, content):
-                module_name = self._extract_module_name(match, pattern, language)
-                if module_name:
-                    dependency = Dependency(
-                        source_module=os.path.dirname(file_path),
-                        target_module=module_name,
-                        dependency_type=DependencyType.IMPORT,
-                        file_path=file_path,
-                        line_number=content[:match.start()].count('\n') + 1,
-                        element_name=module_name.split('.')[-1] if '.' in module_name else module_name
-                    )
-                    dependencies.append(dependency)
+        # 缓存只保存行号和模块名，文件相关字段在此按调用物化
+        source_module = os.path.dirname(file_path)
+        dependencies = []
+        for line_number, module_name in imports:
+            dependency = Dependency(
+                source_module=source_module,
+                target_module=module_name,
+                dependency_type=DependencyType.IMPORT,
+                file_path=file_path,
+                line_number=line_number,
+                element_name=module_name.split('.')[-1] if '.' in module_name else module_name
+            )
+            dependencies.append(dependency)
         
         return dependencies
     
-    def _extract_module_name(self, match, pattern: str, language: str) -> Optional[str]:
+    def _scan_imports(self, content: str, language: str) -> List[Tuple[int, str]]:
+        """
+        扫描文件内容中的导入语句
+        
+        Args:
+            content: 文件内容
+            language: 编程语言（小写）
+            
+        Returns:
+            List[Tuple[int, str]]: (行号, 模块名) 列表
+        """
+        combined = self.compiled_patterns[language]
+        pattern_groups = self.pattern_groups[language]
+        imports = []
+        # 换行符位置在首次命中时一次性计算，每个匹配通过二分查找得到行号
+        line_starts = None
+        
+        for match in combined.finditer(content):
+            pattern, start, end = pattern_groups[match.lastgroup]
+            module_name = self._extract_module_name(match.groups()[start:end], pattern, language)
+            if module_name:
+                if line_starts is None:
+                    line_starts = [m.start() for m in _NEWLINE_PATTERN.finditer(content)]
+                imports.append((bisect.bisect_right(line_starts, match.start()) + 1, module_name))
+        
+        return imports
+    
+    def _extract_module_name(self, groups: Tuple[Optional[str], ...], pattern: str,
+                             language: str) -> Optional[str]:
         """
         从正则匹配中提取模块名称
         
         Args:
-            match: 正则匹配对象
+            groups: 命中模式内部的捕获组
             pattern: 正则模式
             language: 编程语言
             
@@ -180,52 +504,102 @@ class DependencyExtractor:
             Optional[str]: 模块名称
         """
         if language == 'python':
-            if 'from' in pattern:
-                return match.group(1) if match.lastindex == 1 else None
-            else:
-                return match.group(1) if match.lastindex == 1 else None
+            return groups[0] if groups else None
         
         elif language in ['javascript', 'typescript']:
             # 多个匹配组，取最后一个非空组
-            for i in range(match.lastindex, 0, -1):
-                if match.group(i):
-                    return match.group(i)
+            for group in reversed(groups):
+                if group:
+                    return group
         
         elif language == 'java':
-            return match.group(1)
+            return groups[0]
         
         elif language == 'cpp':
-            header = match.group(1)
+            header = groups[0]
             # 排除标准库头文件
             if not header.startswith('<'):
                 return header
         
         elif language == 'go':
             # 处理多行导入块
-            line = match.group(1)
+            line = groups[0]
             if line.strip().startswith('"') and line.strip().endswith('"'):
                 return line.strip()[1:-1]
         
         elif language == 'rust':
-            return match.group(1).split('::')[0] if '::' in match.group(1) else match.group(1)
+            return groups[0].split('::')[0] if '::' in groups[0] else groups[0]
         
         return None
 
 
+# 工作进程内的依赖提取器，由 _init_extract_worker 创建
+_worker_extractor: Optional[DependencyExtractor] = None
+
+
+def _init_extract_worker(use_re2: bool):
+    """
+    初始化依赖提取工作进程
+    
+    Args:
+        use_re2: 是否使用 RE2 引擎
+    """
+    global _worker_extractor
+    _worker_extractor = DependencyExtractor(use_re2=use_re2)
+
+
+def _extract_file_dependencies(job: Tuple[str, str, str]) -> List[Dependency]:
+    """
+    在工作进程中提取单个文件的依赖
+    
+    Args:
+        job: (文件路径, 文件内容, 编程语言)
+        
+    Returns:
+        List[Dependency]: 依赖关系列表
+    """
+    file_path, content, language = job
+    return _worker_extractor.extract_dependencies(file_path, content, language)
+
+
+@functools.lru_cache(maxsize=8192)
+def _normalize_module_name(module_name: str) -> str:
+    """
+    规范化模块名称
+    
+    取第一个 '.' 或 '/' 之前的部分作为模块名。项目中的模块名大量重复，
+    因此结果按原始字符串缓存。
+    
+    Args:
+        module_name: 原始模块名
+        
+    Returns:
+        str: 规范化后的模块名
+    """
+    if not module_name:
+        return 'root'
+    
+    return module_name.partition('.')[0].partition('/')[0]
+
+
 class DependencyGraphBuilder:
     """依赖图构建器"""
     
-    def __init__(self, project_root: str):
+    def __init__(self, project_root: str, max_workers: Optional[int] = None):
         """
         初始化依赖图构建器
         
         Args:
             project_root: 项目根目录
+            max_workers: 并行提取依赖的最大进程数，None 表示使用 CPU 核数，1 表示不并行
         """
         self.project_root = os.path.abspath(project_root)
+        self.max_workers = max_workers
         self.extractor = DependencyExtractor()
         self.modules = {}
         self.graph = DependencyGraph()
+        # 已记录边的哈希索引，使去重检查为 O(1)
+        self._dep_keys: Dict[str, Set[Tuple[str, DependencyType]]] = defaultdict(set)
     
     def build_graph(self, file_analyses: List[Dict]) -> DependencyGraph:
         """
@@ -239,31 +613,33 @@ class DependencyGraphBuilder:
         """
         logger.info("开始构建依赖图")
         
-        # 收集所有模块
+        # 收集所有模块及待提取依赖的文件
+        files = []
+        jobs = []
         for fa in file_analyses:
             file_info = fa.get('file_info', {})
             rel_path = file_info.get('relative_path', '')
-            module_name = self._get_module_name(rel_path)
-            
+            file_path = file_info.get('path', '')
+            content = fa.get('content', '')
+            files.append((self._get_module_name(rel_path), file_path, bool(content)))
+            if content:
+                jobs.append((file_path, content, file_info.get('language', '')))
+        
+        # 提取依赖（CPU 密集的正则扫描，文件较多时分发到进程池）
+        results = iter(self._extract_all(jobs))
+        
+        # 按文件原始顺序登记模块并记录依赖
+        for module_name, file_path, has_content in files:
             if module_name not in self.modules:
                 self.modules[module_name] = ModuleDependencyInfo(
                     module_name=module_name,
-                    module_path=os.path.dirname(file_info.get('path', ''))
+                    module_path=os.path.dirname(file_path)
                 )
             
-            # 提取并记录依赖
-            content = fa.get('content', '')
-            language = file_info.get('language', '')
-            
-            if content:
-                dependencies = self.extractor.extract_dependencies(
-                    file_info.get('path', ''),
-                    content,
-                    language
-                )
-                
-                for dep in dependencies:
-                    self._add_dependency(dep)
+            if has_content:
+                # 源模块每个文件只计算一次，不再逐条依赖规范化
+                for dep in next(results):
+                    self._add_dependency(dep, module_name)
         
         # 计算耦合度指标
         self._calculate_metrics()
@@ -271,10 +647,30 @@ class DependencyGraphBuilder:
         # 构建图结构
         self._build_graph_structure()
         
-        logger.info(f"依赖图构建完成：{len(self.graph.nodes)} 个模块，{len(self.graph.edges)} 条依赖")
+        logger.info(f"依赖图构建完成：{len(self.graph.nodes)} 个模块，{len(self.graph.edge_table)} 条依赖")
         
         return self.graph
     
+    def _extract_all(self, jobs: List[Tuple[str, str, str]]) -> List[List[Dependency]]:
+        """
+        批量提取文件依赖
+        
+        提取器在初始化后只读，文件之间互不影响，可安全地分发到多个进程
+        
+        Args:
+            jobs: (文件路径, 文件内容, 编程语言) 列表
+            
+        Returns:
+            List[List[Dependency]]: 与 jobs 顺序一致的依赖列表
+        """
+        if self.max_workers == 1 or len(jobs) < _PARALLEL_MIN_FILES:
+            return [self.extractor.extract_dependencies(*job) for job in jobs]
+        
+        with ProcessPoolExecutor(max_workers=self.max_workers,
+                                 initializer=_init_extract_worker,
+                                 initargs=(self.extractor.use_re2,)) as executor:
+            return list(executor.map(_extract_file_dependencies, jobs, chunksize=64))
+    
     def _get_module_name(self, rel_path: str) -> str:
         """
         从相对路径获取模块名称
@@ -288,28 +684,29 @@ class DependencyGraphBuilder:
         if not rel_path:
             return 'root'
         
-        parts = rel_path.split(os.sep)
+        # 统一路径分隔符，只截取需要的片段，不切分整条路径
+        path = rel_path.replace('\\', '/')
+        parent, _, file_name = path.rpartition('/')
         
         # 检查是否是包标识文件
-        if parts[-1] == '__init__.py':
-            return parts[-2] if len(parts) > 1 else 'root'
+        if file_name == '__init__.py':
+            return parent.rpartition('/')[2] if parent else 'root'
         
         # 使用第一层目录作为模块名
-        return parts[0] if parts else 'root'
+        return path.partition('/')[0]
     
-    def _add_dependency(self, dependency: Dependency):
+    def _add_dependency(self, dependency: Dependency, source: Optional[str] = None):
         """
         添加依赖关系
         
         Args:
             dependency: 依赖关系
+            source: 已确定的源模块名，未提供时由 dependency.source_module 规范化得到
         """
-        source = dependency.source_module
-        target = dependency.target_module
-        
         # 规范化模块名
-        source = self._normalize_module_name(source)
-        target = self._normalize_module_name(target)
+        if source is None:
+            source = _normalize_module_name(dependency.source_module)
+        target = _normalize_module_name(dependency.target_module)
         
         if source == target:
             return
@@ -328,179 +725,261 @@ class DependencyGraphBuilder:
             )
         
         # 检查依赖是否已存在
-        existing = [d for d in self.modules[source].dependencies
-                   if d.target_module == target and d.dependency_type == dependency.dependency_type]
+        dep_key = (target, dependency.dependency_type)
+        dep_keys = self._dep_keys[source]
         
-        if not existing:
+        if dep_key not in dep_keys:
+            dep_keys.add(dep_key)
             dependency.source_module = source
             dependency.target_module = target
             self.modules[source].dependencies.append(dependency)
+            self.graph.add_edge(dependency)
         
-        # 更新目标模块的入向依赖
-        reverse_dep = Dependency(
-            source_module=target,
-            target_module=source,
-            dependency_type=dependency.dependency_type,
-            strength=dependency.strength,
-            file_path=dependency.file_path,
-            line_number=dependency.line_number,
-            element_name=dependency.element_name
-        )
-        
-        existing_rev = [d for d in self.modules[target].dependents
-                       if d.target_module == source]
-        
-        if not existing_rev:
-            self.modules[target].dependents.append(reverse_dep)
-    
-    def _normalize_module_name(self, module_name: str) -> str:
-        """
-        规范化模块名称
-        
-        Args:
-            module_name: 原始模块名
-            
-        Returns:
-            str: 规范化后的模块名
-        """
-        if not module_name:
-            return 'root'
-        
-        # 移除文件扩展名
-        if '.' in module_name:
-            module_name = module_name.split('.')[0]
-        
-        # 移除常见前缀
-        prefixes = ['src.', 'lib.', 'core.', 'app.']
-        for prefix in prefixes:
-            if module_name.startswith(prefix):
-                module_name = module_name[len(prefix):]
-        
-        return module_name.split('/')[0] if '/' in module_name else module_name
+        # 更新目标模块的入向依赖（只记录源模块名，完整依赖可从边表按需获取）
+        self.modules[target].dependent_sources.add(source)
     
     def _calculate_metrics(self):
         """计算各模块的耦合度指标"""
-        # 计算入向和出向耦合度
-        for module_name, module in self.modules.items():
-            module.efferent_coupling = len(module.dependencies)
-            module.afferent_coupling = len(module.dependents)
+        # 单次遍历计算全部指标，避免对模块集合的多次循环
+        for module in self.modules.values():
+            # 计算入向和出向耦合度
+            efferent = len(module.dependencies)
+            afferent = len(module.dependent_sources)
+            module.efferent_coupling = efferent
+            module.afferent_coupling = afferent
             
             # 计算不稳定性 I = Ce / (Ca + Ce)
-            total = module.afferent_coupling + module.efferent_coupling
-            if total > 0:
-                module.instability = module.efferent_coupling / total
-            else:
-                module.instability = 0.0
-        
-        # 计算抽象度 A = Na / Nc
-        self._calculate_abstraction()
-        
-        # 计算到主序列的距离 D = |A + I - 1|
-        self._calculate_distance()
-    
-    def _calculate_abstraction(self):
-        """计算模块抽象度"""
-        for module_name, module in self.modules.items():
-            # 统计抽象元素数量（接口、抽象类）
-            abstract_count = 0
-            total_count = len(module.core_classes) + len(module.public_interfaces)
+            total = afferent + efferent
+            instability = efferent / total if total > 0 else 0.0
+            module.instability = instability
             
-            for cls in module.core_classes:
-                if 'interface' in cls.lower() or 'abstract' in cls.lower():
-                    abstract_count += 1
+            # 计算抽象度 A = Na / Nc
+            abstraction = self._calculate_abstraction(module)
+            module.abstraction = abstraction
             
-            if total_count > 0:
-                module.abstraction = abstract_count / total_count
-            else:
-                module.abstraction = 0.0
-    
-    def _calculate_distance(self):
-        """计算到主序列的距离"""
-        for module_name, module in self.modules.items():
-            # 主序列公式：D = |A + I - 1|
-            module.distance = abs(module.abstraction + module.instability - 1)
+            # 计算到主序列的距离 D = |A + I - 1|
+            distance = abs(abstraction + instability - 1)
+            module.distance = distance
             
             # 记录指标
             module.metrics = {
-                'afferent_coupling': module.afferent_coupling,
-                'efferent_coupling': module.efferent_coupling,
-                'instability': round(module.instability, 3),
-                'abstraction': round(module.abstraction, 3),
-                'distance': round(module.distance, 3)
+                'afferent_coupling': afferent,
+                'efferent_coupling': efferent,
+                'instability': round(instability, 3),
+                'abstraction': round(abstraction, 3),
+                'distance': round(distance, 3)
             }
     
+    def _calculate_abstraction(self, module: ModuleDependencyInfo) -> float:
+        """
+        计算模块抽象度
+        
+        Args:
+            module: 模块依赖信息
+            
+        Returns:
+            float: 抽象度
+        """
+        # 统计抽象元素数量（接口、抽象类）
+        total_count = len(module.core_classes) + len(module.public_interfaces)
+        if total_count == 0:
+            return 0.0
+        
+        abstract_count = 0
+        for cls in module.core_classes:
+            cls_lower = cls.lower()
+            if 'interface' in cls_lower or 'abstract' in cls_lower:
+                abstract_count += 1
+        
+        return abstract_count / total_count
+    
     def _build_graph_structure(self):
         """构建图结构"""
-        # 添加节点
+        # 添加节点（边已在 _add_dependency 中写入边表）
         for module_name, module in self.modules.items():
             self.graph.nodes[module_name] = module
         
-        # 收集边
-        for module_name, module in self.modules.items():
-            for dep in module.dependencies:
-                self.graph.edges.append(dep)
+        # 构建一次 CSR 邻接表，供后续各图算法复用
+        self.graph.csr = self.graph.edge_table.adjacency()
+        
+        # 各模块总耦合度（入向+出向）只计算一次，供下列统计复用
+        scores = {
+            module_name: module.afferent_coupling + module.efferent_coupling
+            for module_name, module in self.modules.items()
+        }
         
         # 添加元数据
         self.graph.metadata = {
             'total_nodes': len(self.graph.nodes),
-            'total_edges': len(self.graph.edges),
-            'average_coupling': self._calculate_average_coupling(),
-            'max_coupling': self._find_max_coupling_module(),
-            'core_modules': self._identify_core_modules(5),
+            'total_edges': len(self.graph.edge_table),
+            'average_coupling': self._calculate_average_coupling(scores),
+            'max_coupling': self._find_max_coupling_module(scores),
+            'core_modules': self._identify_core_modules(scores, 5),
         }
     
-    def _calculate_average_coupling(self) -> float:
+    def _calculate_average_coupling(self, scores: Dict[str, int]) -> float:
         """计算平均耦合度"""
-        if not self.graph.nodes:
+        if not scores:
             return 0.0
         
-        total_coupling = sum(
-            m.afferent_coupling + m.efferent_coupling
-            for m in self.graph.nodes.values()
-        )
-        
-        return round(total_coupling / len(self.graph.nodes), 2)
+        return round(sum(scores.values()) / len(scores), 2)
     
-    def _find_max_coupling_module(self) -> Optional[str]:
+    def _find_max_coupling_module(self, scores: Dict[str, int]) -> Optional[str]:
         """找出耦合度最高的模块"""
-        max_coupling = -1
-        max_module = None
-        
-        for module_name, module in self.modules.items():
-            coupling = module.afferent_coupling + module.efferent_coupling
-            if coupling > max_coupling:
-                max_coupling = coupling
-                max_module = module_name
+        if not scores:
+            return None
         
-        return max_module
+        return max(scores, key=scores.get)
     
-    def _identify_core_modules(self, count: int = 5) -> List[Dict]:
+    def _identify_core_modules(self, scores: Dict[str, int], count: int = 5) -> List[Dict]:
         """
         识别核心模块
         
         Args:
+            scores: 各模块总耦合度
             count: 返回数量
             
         Returns:
             List[Dict]: 核心模块列表
         """
-        # 根据度数（入度+出度）排序
-        module_scores = []
+        # 根据度数（入度+出度）取前 count 个，只为入选模块构建结果
+        top_modules = heapq.nlargest(count, scores, key=scores.get)
         
-        for module_name, module in self.modules.items():
-            score = module.afferent_coupling + module.efferent_coupling
-            module_scores.append({
+        core_modules = []
+        for module_name in top_modules:
+            module = self.modules[module_name]
+            core_modules.append({
                 'name': module_name,
-                'score': score,
+                'score': scores[module_name],
                 'afferent': module.afferent_coupling,
                 'efferent': module.efferent_coupling,
                 'instability': module.instability
             })
         
-        # 按分数降序排序
-        module_scores.sort(key=lambda x: x['score'], reverse=True)
+        return core_modules
+
+
+def _tarjan_scc(indptr: array, indices: array) -> Tuple[array, int]:
+    """
+    Tarjan 强连通分量算法
+    
+    只操作 CSR 格式的整数数组，使用显式栈代替递归。节点已访问且尚未分配
+    分量编号即表示其仍在 SCC 栈中，因此无需单独维护栈内标记。
+    
+    Args:
+        indptr: CSR 行指针，节点 v 的后继为 indices[indptr[v]:indptr[v + 1]]
+        indices: CSR 列索引
         
-        return module_scores[:count]
+    Returns:
+        Tuple[array, int]: (各节点所属分量编号, 分量总数)，分量按完成顺序编号
+    """
+    n = len(indptr) - 1
+    index = array('i', [-1]) * n
+    lowlink = array('i', bytes(4 * n))
+    comp_id = array('i', [-1]) * n
+    scc_stack = array('i', bytes(4 * n))
+    call_node = array('i', bytes(4 * n))
+    call_pos = array('i', bytes(4 * n))
+    top = 0
+    counter = 0
+    n_comp = 0
+    
+    for root in range(n):
+        if index[root] >= 0:
+            continue
+        
+        index[root] = lowlink[root] = counter
+        counter += 1
+        scc_stack[top] = root
+        top += 1
+        call_node[0] = root
+        call_pos[0] = indptr[root]
+        depth = 1
+        
+        while depth:
+            node = call_node[depth - 1]
+            pos = call_pos[depth - 1]
+            end = indptr[node + 1]
+            descended = False
+            
+            while pos < end:
+                neighbor = indices[pos]
+                pos += 1
+                if index[neighbor] < 0:
+                    # 发现未访问的邻居，保存当前位置后下探
+                    call_pos[depth - 1] = pos
+                    index[neighbor] = lowlink[neighbor] = counter
+                    counter += 1
+                    scc_stack[top] = neighbor
+                    top += 1
+                    call_node[depth] = neighbor
+                    call_pos[depth] = indptr[neighbor]
+                    depth += 1
+                    descended = True
+                    break
+                if comp_id[neighbor] < 0 and index[neighbor] < lowlink[node]:
+                    lowlink[node] = index[neighbor]
+            
+            if descended:
+                continue
+            
+            # 当前节点的邻居已全部访问，出栈并向父节点传播 lowlink
+            depth -= 1
+            if depth:
+                parent = call_node[depth - 1]
+                if lowlink[node] < lowlink[parent]:
+                    lowlink[parent] = lowlink[node]
+            
+            if lowlink[node] == index[node]:
+                while True:
+                    top -= 1
+                    member = scc_stack[top]
+                    comp_id[member] = n_comp
+                    if member == node:
+                        break
+                n_comp += 1
+    
+    return comp_id, n_comp
+
+
+def _shortest_cycle(indptr: array, indices: array, comp_id: array, start: int) -> List[int]:
+    """
+    在 start 所在的强连通分量内求经过 start 的最短环
+    
+    从 start 出发做只经过同一分量节点的广度优先搜索，首次回到 start 时即得到最短环。
+    环上相邻节点之间都是图中真实存在的依赖边。
+    
+    Args:
+        indptr: CSR 行指针
+        indices: CSR 列索引
+        comp_id: 各节点所属分量编号（_tarjan_scc 的结果）
+        start: 起点节点
+        
+    Returns:
+        List[int]: 首尾均为 start 的节点序列
+    """
+    comp = comp_id[start]
+    parent = {start: -1}
+    queue = deque([start])
+    
+    while queue:
+        node = queue.popleft()
+        for neighbor in indices[indptr[node]:indptr[node + 1]]:
+            if neighbor == start:
+                # 沿父节点回溯出 start -> ... -> node，再闭合回 start
+                path = [start]
+                while node != start:
+                    path.append(node)
+                    node = parent[node]
+                path.append(start)
+                path.reverse()
+                return path
+            if comp_id[neighbor] == comp and neighbor not in parent:
+                parent[neighbor] = node
+                queue.append(neighbor)
+    
+    # start 所在分量必然含环，正常情况下不会到达此处
+    return [start, start]
 
 
 class CycleDetector:
@@ -514,120 +993,55 @@ class CycleDetector:
             graph: 依赖图
         """
         self.graph = graph
+        self._scc_cache: Optional[List[List[str]]] = None
+        self._cache_version = -1
     
     def detect_cycles(self) -> List[List[str]]:
         """
         检测循环依赖
         
-        使用深度优先搜索算法检测图中的环
-        
-        Returns:
-            List[List[str]]: 循环依赖列表，每个循环是一个模块名列表
-        """
-        cycles = []
-        visited = set()
-        rec_stack = set()
-        path = []
-        
-        def dfs(node: str):
-            """深度优先搜索"""
-            visited.add(node)
-            rec_stack.add(node)
-            path.append(node)
-            
-            # 获取当前节点的邻居
-            node_info = self.graph.nodes.get(node)
-            if node_info:
-                for dep in node_info.dependencies:
-                    neighbor = dep.target_module
-                    
-                    if neighbor not in visited:
-                        if dfs(neighbor):
-                            return True
-                    elif neighbor in rec_stack:
-                        # 发现循环
-                        cycle_start = path.index(neighbor)
-                        cycle = path[cycle_start:] + [neighbor]
-                        cycles.append(cycle)
-                        return True
-            
-            path.pop()
-            rec_stack.remove(node)
-            return False
-        
-        # 对每个未访问的节点进行DFS
-        for node in self.graph.nodes:
-            if node not in visited:
-                dfs(node)
-        
-        # 移除重复或嵌套的循环
-        unique_cycles = self._unique_cycles(cycles)
-        
-        return unique_cycles
-    
-    def _unique_cycles(self, cycles: List[List[str]]) -> List[List[str]]:
-        """
-        获取唯一的循环依赖
+        使用迭代式 Tarjan 强连通分量算法，单次 O(V+E) 遍历找出所有循环依赖簇。
+        包含多个模块（或存在自依赖）的强连通分量对应一个循环，结果天然不重复；
+        每个分量报告其中经过字典序最小模块的最短环，环上的每一步都是真实的依赖边。
         
-        Args:
-            cycles: 所有检测到的循环
-            
         Returns:
-            List[List[str]]: 去重后的循环列表
+            List[List[str]]: 循环依赖列表，每个循环是一个首尾相接的模块名列表
         """
-        unique = []
+        # 图结构未变更时直接复用上次的检测结果
+        if self._scc_cache is not None and self._cache_version == self.graph.version:
+            return self._scc_cache
         
-        for cycle in cycles:
-            # 规范化循环（旋转到最小元素开始）
-            normalized = self._normalize_cycle(cycle)
-            
-            # 检查是否已存在
-            is_duplicate = False
-            for existing in unique:
-                if set(normalized) == set(existing):
-                    is_duplicate = True
-                    break
-            
-            if not is_duplicate:
-                unique.append(normalized)
+        # 在 CSR 整数数组上求强连通分量，最后一次性解码为模块名
+        names = self.graph.edge_table.module_names
+        indptr, indices = self.graph.adjacency()
+        comp_id, n_comp = _tarjan_scc(indptr, indices)
         
-        return unique
-    
-    def _normalize_cycle(self, cycle: List[str]) -> List[str]:
-        """
-        规范化循环
+        members = [[] for _ in range(n_comp)]
+        for node, comp in enumerate(comp_id):
+            members[comp].append(node)
         
-        将循环旋转到字典序最小的起点
-        
-        Args:
-            cycle: 循环列表
-            
-        Returns:
-            List[str]: 规范化后的循环
-        """
-        if len(cycle) <= 2:
-            return cycle
-        
-        # 找到字典序最小的元素位置
-        min_idx = 0
-        for i in range(1, len(cycle) - 1):
-            if cycle[i] < cycle[min_idx]:
-                min_idx = i
+        cycles = []
+        for scc in members:
+            first = scc[0]
+            if len(scc) > 1 or first in indices[indptr[first]:indptr[first + 1]]:
+                # 以字典序最小的模块为起点，使输出与模块ID分配顺序无关
+                start = min(scc, key=names.__getitem__)
+                cycles.append([names[node] for node in _shortest_cycle(indptr, indices, comp_id, start)])
         
-        # 旋转循环
-        normalized = cycle[min_idx:-1] + cycle[:min_idx] + [cycle[min_idx]]
+        self._scc_cache = cycles
+        self._cache_version = self.graph.version
         
-        return normalized
+        return cycles
     
     def get_cycle_details(self, cycles: List[List[str]]) -> List[Dict]:
         """
         获取循环依赖详情
         
         Args:
-            cycles: 循环列表
+            cycles: 循环列表（detect_cycles 的结果）
             
         Returns:
-            List[Dict]: 循环详情列表
+            List[Dict]: 循环详情列表，modules 为首尾相同的闭合依赖路径，length 为路径上的依赖边数
         """
         details = []
         
@@ -694,14 +1108,16 @@ class CycleDetector:
 class CouplingAnalyzer:
     """耦合度分析器"""
     
-    def __init__(self, graph: DependencyGraph):
+    def __init__(self, graph: DependencyGraph, cycle_detector: Optional[CycleDetector] = None):
         """
         初始化耦合度分析器
         
         Args:
             graph: 依赖图
+            cycle_detector: 共享的循环依赖检测器，未提供时自动创建
         """
         self.graph = graph
+        self.cycle_detector = cycle_detector or CycleDetector(graph)
     
     def analyze_coupling(self) -> Dict[str, Any]:
         """
@@ -736,22 +1152,35 @@ class CouplingAnalyzer:
         if not self.graph.nodes:
             return {}
         
-        modules = list(self.graph.nodes.values())
+        total = len(self.graph.nodes)
+        
+        # 单次遍历同时累加平均指标和不稳定性分布
+        sum_instability = sum_abstraction = 0.0
+        stable = moderate = unstable = 0
+        for m in self.graph.nodes.values():
+            instability = m.instability
+            sum_instability += instability
+            sum_abstraction += m.abstraction
+            if instability < 0.3:
+                stable += 1
+            elif instability > 0.7:
+                unstable += 1
+            else:
+                moderate += 1
         
-        # 计算平均指标
-        avg_instability = sum(m.instability for m in modules) / len(modules)
-        avg_abstraction = sum(m.abstraction for m in modules) / len(modules)
+        avg_instability = sum_instability / total
+        avg_abstraction = sum_abstraction / total
         
         # 统计分布
         instability_distribution = {
-            'stable': sum(1 for m in modules if m.instability < 0.3),
-            'moderate': sum(1 for m in modules if 0.3 <= m.instability <= 0.7),
-            'unstable': sum(1 for m in modules if m.instability > 0.7)
+            'stable': stable,
+            'moderate': moderate,
+            'unstable': unstable
         }
         
         return {
-            'total_modules': len(modules),
-            'total_dependencies': len(self.graph.edges),
+            'total_modules': total,
+            'total_dependencies': len(self.graph.edge_table),
             'average_instability': round(avg_instability, 3),
             'average_abstraction': round(avg_abstraction, 3),
             'instability_distribution': instability_distribution
@@ -802,15 +1231,14 @@ class CouplingAnalyzer:
         violations = []
         
         # 检测循环依赖
-        cycle_detector = CycleDetector(self.graph)
-        cycles = cycle_detector.detect_cycles()
+        cycles = self.cycle_detector.detect_cycles()
         
         for cycle in cycles:
             violations.append({
                 'type': 'cyclic_dependency',
                 'severity': 'high',
                 'modules': cycle,
-                'description': f"发现循环依赖: {' -> '.join(cycle[:-1])}"
+                'description': f"发现循环依赖: {' -> '.join(cycle)}"
             })
         
         # 检测不稳定依赖不稳定（依赖于不稳定模块）
@@ -871,6 +1299,27 @@ class CouplingAnalyzer:
         return recommendations
 
 
+# 节点填充色，按不稳定性区间索引：稳定(<0.3) / 中等 / 不稳定(>0.7)
+_INSTABILITY_COLORS = (b'#ccffcc', b'#ffffcc', b'#ffcccc')
+
+# 节点形状，按抽象度是否超过0.5索引：具体 / 抽象
+_ABSTRACTION_SHAPES = (b'ellipse', b'box')
+
+# DOT 节点定义模板（参数依次为：转义后的名称、名称、不稳定性、形状、填充色）
+_DOT_NODE_TEMPLATE = b'    "%b" [label="%b\\n(I=%.2f)", shape=%b, fillcolor="%b"];\n'
+
+# 依赖类型对应的 DOT 边属性
+_EDGE_STYLES = {
+    DependencyType.INHERIT: b' [style=dashed, color=blue]',
+    DependencyType.CALL: b' [color=green]',
+}
+
+
+def _dot_escape(name: str) -> str:
+    """转义模块名中的双引号，以便放入 DOT 的带引号字符串"""
+    return name.replace('"', '\\"')
+
+
 class DependencyVisualizer:
     """依赖关系可视化器"""
     
@@ -896,48 +1345,11 @@ class DependencyVisualizer:
         Returns:
             str: 输出文件路径
         """
-        dot = graphviz.Digraph(comment='Dependency Graph')
-        
-        # 设置图形属性
-        dot.attr('node', style='filled', fontsize='10')
-        dot.attr('edge', arrowsize='0.5')
-        
-        # 添加节点
-        for module_name, module in self.graph.nodes.items():
-            # 根据不稳定性设置颜色
-            if module.instability > 0.7:
-                color = '#ffcccc'  # 红色 - 不稳定
-            elif module.instability < 0.3:
-                color = '#ccffcc'  # 绿色 - 稳定
-            else:
-                color = '#ffffcc'  # 黄色 - 中等
-            
-            # 根据抽象度设置形状
-            if module.abstraction > 0.5:
-                shape = 'box'
-            else:
-                shape = 'ellipse'
-            
-            label = f"{module_name}\n(I={module.instability:.2f})"
-            dot.node(module_name, label=label, shape=shape, fillcolor=color)
+        # graphviz 仅在导出图片时需要，延迟导入以缩短 CLI 启动时间
+        import graphviz
         
-        # 添加边
-        for dep in self.graph.edges:
-            if not include_external and dep.target_module not in self.graph.nodes:
-                continue
-            
-            # 根据依赖类型设置边的样式
-            style = 'solid'
-            if dep.dependency_type == DependencyType.INHERIT:
-                style = 'dashed'
-                color = 'blue'
-            elif dep.dependency_type == DependencyType.CALL:
-                color = 'green'
-            else:
-                color = 'black'
-            
-            dot.edge(dep.source_module, dep.target_module,
-                    style=style, color=color)
+        # 直接复用 DOT 文本整体渲染，避免逐节点/逐边调用 graphviz API
+        dot = graphviz.Source(self.generate_dot_code(include_external))
         
         # 渲染图片
         output_file = f"{output_path}.{format}"
@@ -954,69 +1366,171 @@ class DependencyVisualizer:
         Returns:
             str: Mermaid格式的图表定义
         """
-        lines = ["```mermaid", "graph TD"]
+        # 以字节缓冲区拼接，每个模块名只编码一次，最后统一解码
+        buf = bytearray(b"```mermaid\ngraph TD\n")
         
         # 添加节点
         for module_name in self.graph.nodes:
-            lines.append(f"    {module_name}[{module_name}]")
-        
-        # 添加边
-        seen_edges = set()
-        for dep in self.graph.edges:
-            edge_key = (dep.source_module, dep.target_module)
-            if edge_key not in seen_edges:
-                seen_edges.add(edge_key)
-                
-                # 根据依赖类型设置箭头样式
-                if dep.dependency_type == DependencyType.INHERIT:
-                    lines.append(f"    {dep.source_module} --|> {dep.target_module}")
-                else:
-                    lines.append(f"    {dep.source_module} --> {dep.target_module}")
+            name = module_name.encode('utf-8')
+            buf += b"    %b[%b]\n" % (name, name)
+        
+        # 添加边（每个模块对只取首条边，已在构建边表时确定）
+        table = self.graph.edge_table
+        names = [name.encode('utf-8') for name in table.module_names]
+        source, target, dep_types = table.source, table.target, table.dep_type
+        for i in table.pair_edges:
+            # 根据依赖类型设置箭头样式
+            if dep_types[i] == DependencyType.INHERIT:
+                buf += b"    %b --|> %b\n" % (names[source[i]], names[target[i]])
+            else:
+                buf += b"    %b --> %b\n" % (names[source[i]], names[target[i]])
         
-        lines.append("```")
+        buf += b"```"
         
-        return '\n'.join(lines)
+        return buf.decode('utf-8')
     
-    def generate_dot_code(self) -> str:
+    def generate_dot_code(self, include_external: bool = True) -> str:
         """
         生成Graphviz DOT格式的依赖图
         
+        Args:
+            include_external: 是否包含指向图外模块的依赖
+            
         Returns:
             str: DOT格式的图定义
         """
-        lines = ["digraph DependencyGraph {"]
-        lines.append('    rankdir=LR;')
-        lines.append('    node [shape=box, style=filled, fontsize=10];')
-        lines.append('    edge [arrowsize=0.5];')
+        nodes = self.graph.nodes
+        # 以字节缓冲区拼接，每个模块名只转义、编码一次，最后统一解码
+        buf = bytearray(
+            b"digraph DependencyGraph {\n"
+            b"    rankdir=LR;\n"
+            b"    node [style=filled, fontsize=10];\n"
+            b"    edge [arrowsize=0.5];\n"
+        )
         
-        # 添加节点
-        for module_name, module in self.graph.nodes.items():
-            # 根据不稳定性设置颜色
-            if module.instability > 0.7:
-                color = 'lightcoral'
-            elif module.instability < 0.3:
-                color = 'lightgreen'
-            else:
-                color = 'lightyellow'
+        # 添加节点：颜色由不稳定性区间决定，形状由抽象度决定
+        template = _DOT_NODE_TEMPLATE
+        colors, shapes = _INSTABILITY_COLORS, _ABSTRACTION_SHAPES
+        for module_name, module in nodes.items():
+            instability = module.instability
+            name = _dot_escape(module_name).encode('utf-8')
+            buf += template % (
+                name,
+                name,
+                instability,
+                shapes[module.abstraction > 0.5],
+                colors[(instability >= 0.3) + (instability > 0.7)],
+            )
+        
+        # 添加边（每个模块对只取首条边，已在构建边表时确定）
+        table = self.graph.edge_table
+        module_names = table.module_names
+        names = [_dot_escape(name).encode('utf-8') for name in module_names]
+        source, target, dep_types = table.source, table.target, table.dep_type
+        for i in table.pair_edges:
+            target_id = target[i]
+            if not include_external and module_names[target_id] not in nodes:
+                continue
             
-            lines.append(f'    {module_name} [label="{module_name}\\n(I={module.instability:.2f})"'
-                        f', fillcolor={color}];')
-        
-        # 添加边
-        seen_edges = set()
-        for dep in self.graph.edges:
-            edge_key = (dep.source_module, dep.target_module)
-            if edge_key not in seen_edges:
-                seen_edges.add(edge_key)
-                
-                if dep.dependency_type == DependencyType.INHERIT:
-                    lines.append(f'    {dep.source_module} -> {dep.target_module} [style=dashed, color=blue];')
-                else:
-                    lines.append(f'    {dep.source_module} -> {dep.target_module};')
+            # 根据依赖类型设置边的样式
+            style = _EDGE_STYLES.get(dep_types[i], b'')
+            buf += b'    "%b" -> "%b"%b;\n' % (names[source[i]], names[target_id], style)
         
-        lines.append("}")
+        buf += b"}"
+        
+        return buf.decode('utf-8')
+
+
+# HTML 报告的静态部分（样式表等），生成时只需在中间写入时间戳和正文
+_HTML_REPORT_HEAD = """<!DOCTYPE html>
+<html lang="zh-CN">
+<head>
+    <meta charset="UTF-8">
+    <meta name="viewport" content="width=device-width, initial-scale=1.0">
+    <title>模块依赖分析报告</title>
+    <style>
+        body {
+            font-family: Arial, sans-serif;
+            max-width: 1200px;
+            margin: 0 auto;
+            padding: 20px;
+            background-color: #f5f5f5;
+        }
+        .container {
+            background-color: white;
+            padding: 30px;
+            border-radius: 8px;
+            box-shadow: 0 2px 4px rgba(0,0,0,0.1);
+        }
+        h1 {
+            color: #333;
+            border-bottom: 2px solid #007bff;
+            padding-bottom: 10px;
+        }
+        h2 {
+            color: #555;
+            margin-top: 30px;
+        }
+        table {
+            width: 100%;
+            border-collapse: collapse;
+            margin: 20px 0;
+        }
+        th, td {
+            border: 1px solid #ddd;
+            padding: 12px;
+            text-align: left;
+        }
+        th {
+            background-color: #007bff;
+            color: white;
+        }
+        tr:nth-child(even) {
+            background-color: #f9f9f9;
+        }
+        .warning {
+            background-color: #fff3cd;
+            border: 1px solid #ffc107;
+            padding: 10px;
+            border-radius: 4px;
+            margin: 10px 0;
+        }
+        .success {
+            background-color: #d4edda;
+            border: 1px solid #28a745;
+            padding: 10px;
+            border-radius: 4px;
+        }
+        .high-risk {
+            background-color: #f8d7da;
+            border: 1px solid #dc3545;
+        }
+    </style>
+</head>
+<body>
+    <div class="container">
+        <h1>模块依赖分析报告</h1>
+        <p>生成时间: """
+
+_HTML_REPORT_INTRO = """</p>
         
-        return '\n'.join(lines)
+        <!-- Markdown内容 -->
+        """
+
+_HTML_REPORT_TAIL = """
+    </div>
+</body>
+</html>
+"""
+
+
+# Markdown 表格行模板（预先绑定 format_map，直接以行数据字典填充）
+_CORE_MODULE_ROW = "| {name} | {score} | {afferent} | {efferent} | {instability:.2f} |\n".format_map
+_HIGH_COUPLING_ROW = "| {module} | {total_coupling} | {afferent} | {efferent} | {risk_level} |\n".format_map
+
+# 架构违规条目与优化建议标题模板
+_VIOLATION_ENTRY = "- **{type}** ({severity})\n  - {description}\n".format_map
+_RECOMMENDATION_HEAD = "### {category}\n\n- **优先级**: {priority}\n".format_map
 
 
 class DependencyReportGenerator:
@@ -1030,8 +1544,44 @@ class DependencyReportGenerator:
             graph: 依赖图
         """
         self.graph = graph
-        self.coupling_analyzer = CouplingAnalyzer(graph)
         self.cycle_detector = CycleDetector(graph)
+        self.coupling_analyzer = CouplingAnalyzer(graph, self.cycle_detector)
+        # 全图分析结果缓存，多种报告格式及 DependencyAnalyzer 共用
+        self._cycles: Optional[List[List[str]]] = None
+        self._cycle_details: Optional[List[Dict]] = None
+        self._coupling: Optional[Dict[str, Any]] = None
+        self._mermaid_chart: Optional[str] = None
+        self._markdown_report: Optional[str] = None
+    
+    def get_cycles(self) -> List[List[str]]:
+        """获取循环依赖列表（首次调用时计算并缓存）"""
+        if self._cycles is None:
+            self._cycles = self.cycle_detector.detect_cycles()
+        return self._cycles
+    
+    def get_cycle_details(self) -> List[Dict]:
+        """获取循环依赖详情（首次调用时计算并缓存）"""
+        if self._cycle_details is None:
+            self._cycle_details = self.cycle_detector.get_cycle_details(self.get_cycles())
+        return self._cycle_details
+    
+    def get_coupling(self) -> Dict[str, Any]:
+        """获取耦合度分析结果（首次调用时计算并缓存）"""
+        if self._coupling is None:
+            self._coupling = self.coupling_analyzer.analyze_coupling()
+        return self._coupling
+    
+    def get_mermaid_chart(self) -> str:
+        """获取Mermaid依赖图（首次调用时生成并缓存）"""
+        if self._mermaid_chart is None:
+            self._mermaid_chart = DependencyVisualizer(self.graph).generate_mermaid_chart()
+        return self._mermaid_chart
+    
+    def get_markdown_report(self) -> str:
+        """获取Markdown报告（首次调用时生成并缓存，HTML报告基于同一份内容）"""
+        if self._markdown_report is None:
+            self._markdown_report = self._generate_markdown_report()
+        return self._markdown_report
     
     def generate_report(self, output_format: str = 'markdown') -> str:
         """
@@ -1048,126 +1598,131 @@ class DependencyReportGenerator:
         elif output_format == 'html':
             return self._generate_html_report()
         else:
-            return self._generate_markdown_report()
+            return self.get_markdown_report()
     
     def _generate_markdown_report(self) -> str:
         """生成Markdown格式报告"""
-        lines = []
+        buf = io.StringIO()
+        write = buf.write
         
         # 标题
-        lines.append("# 模块依赖分析报告\n")
+        write("# 模块依赖分析报告\n\n")
+        
+        metadata = self.graph.metadata
+        total_nodes = metadata.get('total_nodes', 0)
+        total_edges = metadata.get('total_edges', 0)
+        average_coupling = metadata.get('average_coupling', 0)
+        max_coupling = metadata.get('max_coupling', 'N/A')
+        core_modules = metadata.get('core_modules', [])
         
         # 汇总信息
-        lines.append("## 1. 汇总信息\n")
-        lines.append(f"- **模块总数**: {self.graph.metadata.get('total_nodes', 0)}")
-        lines.append(f"- **依赖关系总数**: {self.graph.metadata.get('total_edges', 0)}")
-        lines.append(f"- **平均耦合度**: {self.graph.metadata.get('average_coupling', 0)}")
-        lines.append(f"- **最高耦合模块**: {self.graph.metadata.get('max_coupling', 'N/A')}")
-        lines.append("")
+        write("## 1. 汇总信息\n\n")
+        write(f"- **模块总数**: {total_nodes}\n")
+        write(f"- **依赖关系总数**: {total_edges}\n")
+        write(f"- **平均耦合度**: {average_coupling}\n")
+        write(f"- **最高耦合模块**: {max_coupling}\n")
+        write("\n")
         
         # 核心模块
-        lines.append("## 2. 核心模块\n")
-        lines.append("| 模块 | 分数 | 入向耦合 | 出向耦合 | 不稳定性 |")
-        lines.append("|------|------|---------|---------|----------|")
+        write("## 2. 核心模块\n\n")
+        write("| 模块 | 分数 | 入向耦合 | 出向耦合 | 不稳定性 |\n")
+        write("|------|------|---------|---------|----------|\n")
         
-        core_modules = self.graph.metadata.get('core_modules', [])
         for module in core_modules:
-            lines.append(f"| {module['name']} | {module['score']} | "
-                        f"{module['afferent']} | {module['efferent']} | "
-                        f"{module['instability']:.2f} |")
-        lines.append("")
+            write(_CORE_MODULE_ROW(module))
+        write("\n")
         
         # 循环依赖检测
-        lines.append("## 3. 循环依赖分析\n")
-        cycles = self.cycle_detector.detect_cycles()
+        write("## 3. 循环依赖分析\n\n")
+        cycles = self.get_cycles()
         
         if not cycles:
-            lines.append("✅ 未检测到循环依赖\n")
+            write("✅ 未检测到循环依赖\n\n")
         else:
-            cycle_details = self.cycle_detector.get_cycle_details(cycles)
-            for detail in cycle_details:
-                lines.append(f"### 循环 {detail['cycle_id']}\n")
-                lines.append(f"- **严重程度**: {detail['severity']}")
-                lines.append(f"- **涉及模块**: {' → '.join(detail['modules'][:-1])}")
-                lines.append("- **优化建议**:")
+            for detail in self.get_cycle_details():
+                write(f"### 循环 {detail['cycle_id']}\n\n")
+                write(f"- **严重程度**: {detail['severity']}\n")
+                # 首尾为同一模块的闭合路径，相邻模块之间均为真实的依赖边
+                write(f"- **循环路径**: {' → '.join(detail['modules'])}\n")
+                write("- **优化建议**:\n")
                 for suggestion in detail['breaking_suggestions']:
-                    lines.append(f"  - {suggestion}")
-                lines.append("")
+                    write(f"  - {suggestion}\n")
+                write("\n")
         
         # 耦合度分析
-        lines.append("## 4. 耦合度分析\n")
-        coupling_analysis = self.coupling_analyzer.analyze_coupling()
+        write("## 4. 耦合度分析\n\n")
+        coupling_analysis = self.get_coupling()
         
-        lines.append("### 4.1 汇总\n")
+        write("### 4.1 汇总\n\n")
         summary = coupling_analysis['summary']
-        lines.append(f"- 平均不稳定性: {summary.get('average_instability', 0)}")
-        lines.append(f"- 平均抽象度: {summary.get('average_abstraction', 0)}")
+        write(f"- 平均不稳定性: {summary.get('average_instability', 0)}\n")
+        write(f"- 平均抽象度: {summary.get('average_abstraction', 0)}\n")
         
         dist = summary.get('instability_distribution', {})
-        lines.append(f"- 稳定模块数: {dist.get('stable', 0)}")
-        lines.append(f"- 中等模块数: {dist.get('moderate', 0)}")
-        lines.append(f"- 不稳定模块数: {dist.get('unstable', 0)}")
-        lines.append("")
+        write(f"- 稳定模块数: {dist.get('stable', 0)}\n")
+        write(f"- 中等模块数: {dist.get('moderate', 0)}\n")
+        write(f"- 不稳定模块数: {dist.get('unstable', 0)}\n")
+        write("\n")
         
-        lines.append("### 4.2 高耦合模块\n")
+        write("### 4.2 高耦合模块\n\n")
         high_coupling = coupling_analysis['high_coupling']
         if high_coupling:
-            lines.append("| 模块 | 总耦合度 | 入向 | 出向 | 风险级别 |")
-            lines.append("|------|---------|------|------|----------|")
+            write("| 模块 | 总耦合度 | 入向 | 出向 | 风险级别 |\n")
+            write("|------|---------|------|------|----------|\n")
             for module in high_coupling:
-                lines.append(f"| {module['module']} | {module['total_coupling']} | "
-                            f"{module['afferent']} | {module['efferent']} | "
-                            f"{module['risk_level']} |")
+                write(_HIGH_COUPLING_ROW(module))
         else:
-            lines.append("✅ 未发现高耦合模块\n")
-        lines.append("")
+            write("✅ 未发现高耦合模块\n\n")
+        write("\n")
         
         # 架构违规
-        lines.append("## 5. 架构违规检测\n")
+        write("## 5. 架构违规检测\n\n")
         violations = coupling_analysis['violations']
         if violations:
             for violation in violations:
-                lines.append(f"- **{violation['type']}** ({violation['severity']})")
-                lines.append(f"  - {violation['description']}")
+                write(_VIOLATION_ENTRY(violation))
         else:
-            lines.append("✅ 未检测到架构违规\n")
-        lines.append("")
+            write("✅ 未检测到架构违规\n\n")
+        write("\n")
         
         # 优化建议
-        lines.append("## 6. 优化建议\n")
+        write("## 6. 优化建议\n\n")
         recommendations = coupling_analysis['recommendations']
         for rec in recommendations:
-            lines.append(f"### {rec['category']}\n")
-            lines.append(f"- **优先级**: {rec['priority']}")
+            write(_RECOMMENDATION_HEAD(rec))
             if 'modules' in rec:
-                lines.append(f"- **涉及模块**: {', '.join(rec['modules'])}")
-            lines.append(f"- **建议**: {rec['suggestion']}")
-            lines.append("")
+                write(f"- **涉及模块**: {', '.join(rec['modules'])}\n")
+            write(f"- **建议**: {rec['suggestion']}\n\n")
         
         # 依赖图
-        lines.append("## 7. 依赖图\n")
-        visualizer = DependencyVisualizer(self.graph)
-        lines.append(visualizer.generate_mermaid_chart())
+        write("## 7. 依赖图\n\n")
+        write(self.get_mermaid_chart())
         
-        return '\n'.join(lines)
+        return buf.getvalue()
     
     def _generate_json_report(self) -> str:
-        """生成JSON格式报告"""
-        coupling_analysis = self.coupling_analyzer.analyze_coupling()
-        cycles = self.cycle_detector.detect_cycles()
+        """
+        生成JSON格式报告
         
-        report = {
-            'metadata': self.graph.metadata,
-            'modules': {},
-            'coupling_analysis': coupling_analysis,
-            'cycles': {
-                'detected': len(cycles),
-                'details': self.cycle_detector.get_cycle_details(cycles)
-            }
-        }
+        按顶层字段和逐个模块分段序列化后写入缓冲区，不再先构建包含全部模块的
+        嵌套字典，峰值内存只取决于输出文本本身。
+        """
+        cycles = self.get_cycles()
+        buf = io.StringIO()
+        write = buf.write
         
+        write('{\n  "metadata": ')
+        write(_json_dumps(self.graph.metadata, 1))
+        
+        write(',\n  "modules": {')
+        labels = _DEP_TYPE_LABELS
+        separator = '\n    '
         for module_name, module in self.graph.nodes.items():
-            report['modules'][module_name] = {
+            write(separator)
+            separator = ',\n    '
+            write(_json_dumps(module_name))
+            write(': ')
+            write(_json_dumps({
                 'name': module.module_name,
                 'path': module.module_path,
                 'coupling': {
@@ -1180,110 +1735,86 @@ class DependencyReportGenerator:
                 'dependencies': [
                     {
                         'target': dep.target_module,
-                        'type': dep.dependency_type.value,
+                        'type': labels[dep.dependency_type],
                         'strength': dep.strength
                     }
                     for dep in module.dependencies
                 ]
-            }
+            }, 2))
+        write('\n  }' if self.graph.nodes else '}')
+        
+        write(',\n  "coupling_analysis": ')
+        write(_json_dumps(self.get_coupling(), 1))
+        
+        write(',\n  "cycles": ')
+        write(_json_dumps({
+            'detected': len(cycles),
+            'details': self.get_cycle_details()
+        }, 1))
+        write('\n}')
         
-        return json.dumps(report, ensure_ascii=False, indent=2)
+        return buf.getvalue()
     
     def _generate_html_report(self) -> str:
         """生成HTML格式报告"""
-        markdown_report = self._generate_markdown_report()
+        import time
         
-        html = f"""<!DOCTYPE html>
-<html lang="zh-CN">
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>模块依赖分析报告</title>
-    <style>
-        body {{
-            font-family: Arial, sans-serif;
-            max-width: 1200px;
-            margin: 0 auto;
-            padding: 20px;
-            background-color: #f5f5f5;
-        }}
-        .container {{
-            background-color: white;
-            padding: 30px;
-            border-radius: 8px;
-            box-shadow: 0 2px 4px rgba(0,0,0,0.1);
-        }}
-        h1 {{
-            color: #333;
-            border-bottom: 2px solid #007bff;
-            padding-bottom: 10px;
-        }}
-        h2 {{
-            color: #555;
-            margin-top: 30px;
-        }}
-        table {{
-            width: 100%;
-            border-collapse: collapse;
-            margin: 20px 0;
-        }}
-        th, td {{
-            border: 1px solid #ddd;
-            padding: 12px;
-            text-align: left;
-        }}
-        th {{
-            background-color: #007bff;
-            color: white;
-        }}
-        tr:nth-child(even) {{
-            background-color: #f9f9f9;
-        }}
-        .warning {{
-            background-color: #fff3cd;
-            border: 1px solid #ffc107;
-            padding: 10px;
-            border-radius: 4px;
-            margin: 10px 0;
-        }}
-        .success {{
-            background-color: #d4edda;
-            border: 1px solid #28a745;
-            padding: 10px;
-            border-radius: 4px;
-        }}
-        .high-risk {{
-            background-color: #f8d7da;
-            border: 1px solid #dc3545;
-        }}
-    </style>
-</head>
-<body>
-    <div class="container">
-        <h1>模块依赖分析报告</h1>
-        <p>生成时间: {time.strftime('%Y-%m-%d %H:%M:%S')}</p>
+        markdown_report = self.get_markdown_report()
         
-        <!-- Markdown内容 -->
-        {self._markdown_to_html(markdown_report)}
-    </div>
-</body>
-</html>
-"""
+        buf = io.StringIO()
+        write = buf.write
+        write(_HTML_REPORT_HEAD)
+        write(time.strftime('%Y-%m-%d %H:%M:%S'))
+        write(_HTML_REPORT_INTRO)
         
-        return html
+        # Markdown 内容逐行转换后直接写入同一缓冲区
+        self._write_markdown_html(markdown_report, write)
+        write(_HTML_REPORT_TAIL)
+        
+        return buf.getvalue()
     
     def _markdown_to_html(self, markdown: str) -> str:
         """简单的Markdown转HTML"""
-        # 简化实现
-        html = markdown.replace('\n', '<br>')
-        html = re.sub(r'# (.*?)<br>', r'<h1>\1</h1>', html)
-        html = re.sub(r'## (.*?)<br>', r'<h2>\1</h2>', html)
-        html = re.sub(r'### (.*?)<br>', r'<h3>\1</h3>', html)
-        html = re.sub(r'\*\*(.*?)\*\*', r'<strong>\1</strong>', html)
-        html = re.sub(r'\*(.*?)\*', r'<em>\1</em>', html)
-        html = re.sub(r'```mermaid\n(.*?)\n```', r'<div class="mermaid">\1</div>', html, flags=re.DOTALL)
+        buf = io.StringIO()
+        self._write_markdown_html(markdown, buf.write)
+        return buf.getvalue()
+    
+    def _write_markdown_html(self, markdown: str, write):
+        """
+        逐行将Markdown转换为HTML并写出
+        
+        只需对全文切分一次：标题和 mermaid 代码块通过行首前缀判断，
+        行内的加粗/斜体正则只作用于单行，不再对整篇文档做多遍替换
         
-        return html
+        Args:
+            markdown: Markdown文本
+            write: 输出写入函数
+        """
+        mermaid_lines = None
+        
+        for line in markdown.split('\n'):
+            if mermaid_lines is not None:
+                if line == '```':
+                    write('<div class="mermaid">')
+                    write('\n'.join(mermaid_lines))
+                    write('</div>')
+                    mermaid_lines = None
+                else:
+                    mermaid_lines.append(line)
+            elif line.startswith('```mermaid'):
+                mermaid_lines = []
+            elif line.startswith('### '):
+                write(f'<h3>{line[4:]}</h3>')
+            elif line.startswith('## '):
+                write(f'<h2>{line[3:]}</h2>')
+            elif line.startswith('# '):
+                write(f'<h1>{line[2:]}</h1>')
+            else:
+                if '*' in line:
+                    line = _STRONG_PATTERN.sub(r'<strong>\1</strong>', line)
+                    line = _EMPHASIS_PATTERN.sub(r'<em>\1</em>', line)
+                write(line)
+                write('<br>')
 
 
 class DependencyAnalyzer:
@@ -1298,13 +1829,16 @@ class DependencyAnalyzer:
         """
         self.project_root = project_root
         self.graph = None
+        self.report_generator = None
     
-    def analyze(self, file_analyses: List[Dict]) -> Dict[str, Any]:
+    def analyze(self, file_analyses: List[Dict], generate_report: bool = True) -> Dict[str, Any]:
         """
         执行依赖分析
         
         Args:
             file_analyses: 文件分析结果列表
+            generate_report: 是否生成Markdown报告；为 False 时 result['report'] 为 None，
+                之后仍可通过 self.report_generator 按需生成
             
         Returns:
             Dict[str, Any]: 分析结果
@@ -1315,17 +1849,14 @@ class DependencyAnalyzer:
         builder = DependencyGraphBuilder(self.project_root)
         self.graph = builder.build_graph(file_analyses)
         
-        # 生成报告
+        # 生成报告（只需循环依赖等结果时跳过报告和 mermaid 图的构建）
         report_generator = DependencyReportGenerator(self.graph)
-        report = report_generator.generate_report('markdown')
+        self.report_generator = report_generator
+        report = report_generator.generate_report('markdown') if generate_report else None
         
-        # 循环依赖检测
-        cycle_detector = CycleDetector(self.graph)
-        cycles = cycle_detector.detect_cycles()
-        
-        # 耦合度分析
-        coupling_analyzer = CouplingAnalyzer(self.graph)
-        coupling_analysis = coupling_analyzer.analyze_coupling()
+        # 循环依赖检测与耦合度分析直接复用报告生成时的缓存结果
+        cycles = report_generator.get_cycles()
+        coupling_analysis = report_generator.get_coupling()
         
         result = {
             'graph': self.graph,
@@ -1333,12 +1864,12 @@ class DependencyAnalyzer:
             'cycles': {
                 'detected': len(cycles),
                 'list': [c[:-1] for c in cycles],
-                'details': cycle_detector.get_cycle_details(cycles)
+                'details': report_generator.get_cycle_details()
             },
             'coupling': coupling_analysis,
             'metrics': {
                 'total_modules': len(self.graph.nodes),
-                'total_dependencies': len(self.graph.edges),
+                'total_dependencies': len(self.graph.edge_table),
                 'core_modules': self.graph.metadata.get('core_modules', []),
                 'average_coupling': self.graph.metadata.get('average_coupling', 0)
             }
@@ -1402,8 +1933,10 @@ def main():
         logging.getLogger().setLevel(logging.DEBUG)
     
     # 加载分析结果
-    with open(args.input, 'r', encoding='utf-8') as f:
-        data = json.load(f)
+    # 以二进制读取，由解析器直接处理UTF-8字节（orjson不可用时回退到标准库json）
+    with open(args.input, 'rb') as f:
+        raw = f.read()
+    data = orjson.loads(raw) if orjson is not None else json.loads(raw)
     
     # 初始化分析器
     project_root = data.get('project_info', {}).get('path', '.')
@@ -1411,17 +1944,18 @@ def main():
     
     # 执行分析
     file_analyses = data.get('file_analysis', [])
-    result = analyzer.analyze(file_analyses)
+    result = analyzer.analyze(file_analyses, generate_report=not args.detect_cycles)
     
     if args.detect_cycles:
         print(f"检测到 {result['cycles']['detected']} 个循环依赖:")
         for i, cycle in enumerate(result['cycles']['list'], 1):
-            print(f"  {i}. {' -> '.join(cycle)}")
+            print(f"  {i}. {' -> '.join(cycle + cycle[:1])}")
     else:
         # 输出报告
         if args.output:
-            with open(args.output, 'w', encoding='utf-8') as f:
-                f.write(result['report'])
+            # 报告已整体构建为字符串，一次编码后以二进制写出，跳过文本层的增量编码
+            with open(args.output, 'wb') as f:
+                f.write(result['report'].encode('utf-8'))
             print(f"报告已保存到: {args.output}")
         else:
             print(result['report'])
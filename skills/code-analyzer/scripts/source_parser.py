@@ -14,16 +14,41 @@ import os
 import sys
 import ast
 import re
+import bisect
 import json
 import logging
 import hashlib
+import io
+import pickle
 import time
-from dataclasses import dataclass, field
-from typing import Dict, List, Optional, Tuple, Any, Set
+from dataclasses import dataclass, field, fields, is_dataclass
+from typing import Dict, List, Optional, Tuple, Any, Set, Iterator, Union, BinaryIO
 from pathlib import Path
 from enum import Enum
-from collections import defaultdict
+from collections import Counter, defaultdict, deque, OrderedDict
 import concurrent.futures
+from itertools import compress, count, repeat
+from operator import contains
+
+try:
+    # orjson 使用C实现的编码器，序列化大量小字符串时比标准库json快数倍
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    # BLAKE3 利用SIMD指令并行计算，为大文件生成缓存键时比SHA-256快数倍
+    from blake3 import blake3 as _cache_hasher
+except ImportError:
+    _cache_hasher = hashlib.sha256
+
+try:
+    # xxh3 为SIMD优化的非加密哈希，计算内存缓存键时几乎不占用解析的开销
+    from xxhash import xxh3_64_intdigest as _memo_digest
+except ImportError:
+    def _memo_digest(data: bytes) -> bytes:
+        """未安装xxhash时的内存缓存键摘要"""
+        return hashlib.blake2b(data, digest_size=8).digest()
 
 # 配置日志记录器
 logging.basicConfig(
@@ -33,6 +58,107 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# 换行符模式，用于一次性计算文件内所有换行位置
+_NEWLINE_PATTERN = re.compile('\n')
+
+# 文件数达到该阈值时才启用多进程获取文件信息，避免小项目承担进程启动开销
+_PARALLEL_SCAN_MIN_FILES = 500
+
+# 待解析文件数达到该阈值时才启用多进程解析
+_PARALLEL_PARSE_MIN_FILES = 256
+
+# 并发读取源文件的线程数（读取时释放GIL，可同时向磁盘发出多个读请求）
+_READ_MAX_WORKERS = 32
+
+# 最多提前读取的文件数，限制同时驻留内存的文件内容
+_READ_AHEAD_FILES = 1024
+
+# 解析结果缓存格式版本，任一语言的解析逻辑或结果结构变化时递增，使旧缓存失效
+_PARSE_CACHE_VERSION = 7
+
+# Python 3.10+ 的数据类支持 __slots__，实例不再携带 __dict__，省内存且属性访问更快
+_DATACLASS_OPTIONS = {'slots': True} if sys.version_info >= (3, 10) else {}
+
+
+def _json_default(obj: Any) -> Any:
+    """
+    标准库json无法直接编码的对象的转换函数，与orjson的原生行为保持一致
+    
+    数据类按字段浅层转换为字典（嵌套对象由编码器继续处理），枚举取其值。
+    
+    Args:
+        obj: 待转换对象
+        
+    Returns:
+        可被json编码的对象
+    """
+    if is_dataclass(obj):
+        return {f.name: getattr(obj, f.name) for f in fields(obj)}
+    if isinstance(obj, Enum):
+        return obj.value
+    raise TypeError(f'Object of type {obj.__class__.__name__} is not JSON serializable')
+
+
+def _json_dumps(obj: Any) -> bytes:
+    """
+    将分析结果序列化为UTF-8编码的JSON
+    
+    安装了orjson时使用其C实现编码器（原生支持数据类和枚举），
+    否则回退到标准库json，两者输出一致。
+    
+    Args:
+        obj: 待序列化对象
+        
+    Returns:
+        UTF-8编码的JSON字节串
+    """
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+    return json.dumps(obj, ensure_ascii=False, indent=2, default=_json_default).encode('utf-8')
+
+
+def _json_dump(obj: Any, fp: BinaryIO):
+    """
+    将分析结果以UTF-8编码的JSON直接写入二进制流
+    
+    标准库json回退路径下边编码边写入，不在内存中拼出完整的JSON字符串；
+    orjson一次性生成字节串，同样省去解码为str再输出的拷贝。输出与 _json_dumps 一致。
+    
+    Args:
+        obj: 待序列化对象
+        fp: 以二进制模式打开的可写流
+    """
+    if orjson is not None:
+        fp.write(orjson.dumps(obj, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS))
+        return
+    writer = io.TextIOWrapper(fp, encoding='utf-8', newline='')
+    try:
+        json.dump(obj, writer, ensure_ascii=False, indent=2, default=_json_default)
+        writer.flush()
+    finally:
+        # 解除包装，避免关闭或回收包装器时连带关闭调用方的流
+        writer.detach()
+
+
+def _write_pickle(path: Path, obj: Any):
+    """
+    将对象写入pickle缓存文件
+    
+    先写临时文件再原子替换，避免并发运行读到不完整的缓存；写入失败只记录日志。
+    
+    Args:
+        path: 缓存文件路径
+        obj: 待写入对象
+    """
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+        with open(tmp_path, 'wb') as f:
+            pickle.dump(obj, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, path)
+    except OSError as e:
+        logger.debug(f"写入缓存失败 {path}: {e}")
+
 
 class Language(Enum):
     """支持的编程语言枚举"""
@@ -67,7 +193,7 @@ class ElementType(Enum):
     DECORATOR = "decorator"
 
 
-@dataclass
+@dataclass(**_DATACLASS_OPTIONS)
 class CodeElement:
     """代码元素数据类"""
     name: str                          # 元素名称
@@ -91,7 +217,7 @@ class CodeElement:
     complexity: int = 1                # 圈复杂度
 
 
-@dataclass
+@dataclass(**_DATACLASS_OPTIONS)
 class FileInfo:
     """文件信息数据类"""
     file_path: str                     # 文件路径
@@ -106,7 +232,7 @@ class FileInfo:
     metadata: Dict[str, Any] = field(default_factory=dict)  # 元数据
 
 
-@dataclass
+@dataclass(**_DATACLASS_OPTIONS)
 class ModuleInfo:
     """模块信息数据类"""
     name: str                          # 模块名称
@@ -165,6 +291,7 @@ class ProjectScanner:
             config: 配置字典，可包含排除规则等
         """
         self.config = config or {}
+        self.max_workers = self.config.get('max_workers')
         self.exclude_dirs = self.EXCLUDE_DIRS.copy()
         self.exclude_patterns = set()
         self.include_patterns = set()
@@ -176,6 +303,25 @@ class ProjectScanner:
             self.exclude_patterns.update(self.config['exclude_patterns'])
         if 'include_patterns' in self.config:
             self.include_patterns.update(self.config['include_patterns'])
+        
+        # 预编译文件名模式：同一方向的多个模式合并为一个交替正则，每个文件只需匹配一次
+        self._exclude_re = self._compile_patterns(self.exclude_patterns)
+        self._include_re = self._compile_patterns(self.include_patterns)
+    
+    @staticmethod
+    def _compile_patterns(patterns: Set[str]) -> Optional[re.Pattern]:
+        """
+        将多个文件名模式合并编译为单个正则表达式
+        
+        Args:
+            patterns: 正则模式集合
+            
+        Returns:
+            Optional[re.Pattern]: 合并后的正则，模式集合为空时返回None
+        """
+        if not patterns:
+            return None
+        return re.compile('|'.join(f'(?:{pattern})' for pattern in patterns))
     
     def scan(self, project_path: str) -> Dict[str, Any]:
         """
@@ -203,45 +349,16 @@ class ProjectScanner:
         
         project_path = os.path.abspath(project_path)
         
-        for root, dirs, files in os.walk(project_path):
-            # 过滤目录
-            dirs[:] = [d for d in dirs if d not in self.exclude_dirs]
-            
-            # 构建相对路径
-            rel_path = os.path.relpath(root, project_path)
-            if rel_path == '.':
-                rel_path = ''
-            
-            # 处理文件
-            for file in files:
-                file_path = os.path.join(root, file)
-                file_ext = os.path.splitext(file)[1].lower()
-                
-                # 检查排除模式
-                if self._match_exclude_pattern(file):
-                    continue
-                
-                # 检查包含模式
-                if self.include_patterns and not self._match_include_pattern(file):
-                    continue
-                
-                # 获取文件信息
-                file_info = self._get_file_info(file_path, project_path, rel_path)
-                
-                # 分类文件
-                if file_ext in self.EXTENSION_MAP:
-                    result['source_files'].append(file_info)
-                elif file in ['package.json', 'pom.xml', 'build.gradle', 'go.mod']:
-                    result['config_files'].append(file_info)
-                elif file.startswith('test_') or file.endswith('_test.py') or file.endswith('.test.js'):
-                    result['test_files'].append(file_info)
-                elif file.endswith(('.md', '.txt', '.rst', '.doc')):
-                    result['documentation_files'].append(file_info)
-                
-                result['statistics']['total_files'] += 1
-                result['statistics']['total_size'] += file_info['size']
+        # 先遍历目录树收集候选文件，再统一获取文件信息并分类
+        files, total_dirs = self._walk(project_path)
+        result['statistics']['total_dirs'] = total_dirs
+        
+        for category, file_info in self._classify_all(files, project_path):
+            if category:
+                result[category].append(file_info)
             
-            result['statistics']['total_dirs'] += len(dirs)
+            result['statistics']['total_files'] += 1
+            result['statistics']['total_size'] += file_info['size']
         
         # 构建文件树
         result['file_tree'] = self._build_file_tree(result['source_files'])
@@ -253,21 +370,151 @@ class ProjectScanner:
         
         return result
     
+    @staticmethod
+    def serialize(result: Dict[str, Any]) -> bytes:
+        """
+        将扫描或分析结果序列化为JSON
+        
+        Args:
+            result: scan或analyze返回的结果字典
+            
+        Returns:
+            UTF-8编码的JSON字节串
+        """
+        return _json_dumps(result)
+    
+    @staticmethod
+    def dump(result: Dict[str, Any], fp: BinaryIO):
+        """
+        将扫描或分析结果以JSON写入二进制流，不构造完整的中间字符串
+        
+        Args:
+            result: scan或analyze返回的结果字典
+            fp: 以二进制模式打开的可写流
+        """
+        _json_dump(result, fp)
+    
+    def _walk(self, project_path: str) -> Tuple[List[Tuple[os.DirEntry, str]], int]:
+        """
+        遍历目录树，收集通过排除/包含模式过滤的文件
+        
+        直接使用 os.scandir 以保留 DirEntry，后续获取文件信息时可复用其 stat 结果
+        （Windows 上由目录读取顺带返回，无需额外系统调用）。遍历顺序与 os.walk
+        自顶向下的顺序一致，且同样不进入符号链接指向的目录。
+        
+        Args:
+            project_path: 项目根目录绝对路径
+            
+        Returns:
+            Tuple[List[Tuple[os.DirEntry, str]], int]: (文件目录项, 所在目录相对路径) 列表及目录总数
+        """
+        files = []
+        total_dirs = 0
+        stack = [(project_path, '')]
+        
+        while stack:
+            dir_path, rel_path = stack.pop()
+            try:
+                with os.scandir(dir_path) as it:
+                    entries = list(it)
+            except OSError:
+                continue
+            
+            subdirs = []
+            for entry in entries:
+                try:
+                    is_dir = entry.is_dir()
+                except OSError:
+                    is_dir = False
+                
+                if is_dir:
+                    # 过滤目录
+                    if entry.name not in self.exclude_dirs:
+                        subdirs.append(entry)
+                    continue
+                
+                # 检查排除模式
+                if self._match_exclude_pattern(entry.name):
+                    continue
+                
+                # 检查包含模式
+                if self.include_patterns and not self._match_include_pattern(entry.name):
+                    continue
+                
+                files.append((entry, rel_path))
+            
+            total_dirs += len(subdirs)
+            
+            # 逆序入栈，使子目录按列出顺序依次展开
+            for entry in reversed(subdirs):
+                if not entry.is_symlink():
+                    stack.append((entry.path, os.path.join(rel_path, entry.name) if rel_path else entry.name))
+        
+        return files, total_dirs
+    
     def _match_exclude_pattern(self, file_name: str) -> bool:
         """检查文件是否匹配排除模式"""
-        for pattern in self.exclude_patterns:
-            if re.match(pattern, file_name):
-                return True
-        return False
+        return self._exclude_re is not None and self._exclude_re.match(file_name) is not None
     
     def _match_include_pattern(self, file_name: str) -> bool:
         """检查文件是否匹配包含模式"""
-        for pattern in self.include_patterns:
-            if re.match(pattern, file_name):
-                return True
-        return False
+        return self._include_re is not None and self._include_re.match(file_name) is not None
+    
+    def _classify_all(self, files: List[Tuple[os.DirEntry, str]],
+                      project_path: str) -> List[Tuple[Optional[str], Dict[str, Any]]]:
+        """
+        批量获取文件信息并分类
+        
+        各文件的 stat 和分类互不影响，文件较多时分发到多个进程执行。
+        DirEntry 无法跨进程传递，多进程时改为传递路径并在工作进程中 stat。
+        
+        Args:
+            files: (文件目录项, 所在目录相对路径) 列表
+            project_path: 项目根路径
+            
+        Returns:
+            List[Tuple[Optional[str], Dict[str, Any]]]: 与 files 顺序一致的 (分类, 文件信息) 列表
+        """
+        if self.max_workers == 1 or len(files) < _PARALLEL_SCAN_MIN_FILES:
+            return [self._classify_file(entry.path, project_path, rel_path, entry.stat())
+                    for entry, rel_path in files]
+        
+        jobs = [(entry.path, project_path, rel_path) for entry, rel_path in files]
+        with concurrent.futures.ProcessPoolExecutor(max_workers=self.max_workers) as executor:
+            return list(executor.map(_classify_scanned_file, jobs, chunksize=128))
     
-    def _get_file_info(self, file_path: str, project_path: str, rel_path: str) -> Dict[str, Any]:
+    def _classify_file(self, file_path: str, project_path: str, rel_path: str,
+                       stat: Optional[os.stat_result] = None) -> Tuple[Optional[str], Dict[str, Any]]:
+        """
+        获取单个文件的信息并确定其分类
+        
+        Args:
+            file_path: 文件完整路径
+            project_path: 项目根路径
+            rel_path: 相对路径
+            stat: 已获取的文件状态，为None时重新获取
+            
+        Returns:
+            Tuple[Optional[str], Dict[str, Any]]: 扫描结果中的分类键（不属于任何分类时为None）及文件信息
+        """
+        file_info = self._get_file_info(file_path, project_path, rel_path, stat)
+        file = file_info['name']
+        
+        if file_info['extension'] in self.EXTENSION_MAP:
+            category = 'source_files'
+        elif file in ['package.json', 'pom.xml', 'build.gradle', 'go.mod']:
+            category = 'config_files'
+        elif file.startswith('test_') or file.endswith('_test.py') or file.endswith('.test.js'):
+            category = 'test_files'
+        elif file.endswith(('.md', '.txt', '.rst', '.doc')):
+            category = 'documentation_files'
+        else:
+            category = None
+        
+        return category, file_info
+    
+    def _get_file_info(self, file_path: str, project_path: str, rel_path: str,
+                       stat: Optional[os.stat_result] = None) -> Dict[str, Any]:
         """
         获取文件信息
         
@@ -275,12 +522,14 @@ class ProjectScanner:
             file_path: 文件完整路径
             project_path: 项目根路径
             rel_path: 相对路径
+            stat: 已获取的文件状态，为None时重新获取
             
         Returns:
             Dict[str, Any]: 文件信息字典
         """
         file_ext = os.path.splitext(file_path)[1].lower()
-        stat = os.stat(file_path)
+        if stat is None:
+            stat = os.stat(file_path)
         
         return {
             'path': file_path,
@@ -303,18 +552,19 @@ class ProjectScanner:
             Dict[str, Any]: 文件树结构
         """
         file_tree = {}
+        # 相对目录路径到其树节点的映射，同一目录下的文件无需再逐级查找
+        dir_nodes = {'': file_tree}
         
         for file_info in source_files:
-            path_parts = file_info['relative_path'].split(os.sep)
-            current = file_tree
-            
-            for part in path_parts[:-1]:
-                if part not in current:
-                    current[part] = {}
-                current = current[part]
+            rel_dir, file_name = os.path.split(file_info['relative_path'])
+            current = dir_nodes.get(rel_dir)
+            if current is None:
+                current = file_tree
+                for part in rel_dir.split(os.sep):
+                    current = current.setdefault(part, {})
+                dir_nodes[rel_dir] = current
             
             # 添加文件节点
-            file_name = path_parts[-1]
             current[file_name] = {
                 '_file_info': file_info
             }
@@ -359,20 +609,68 @@ class ProjectScanner:
         return entry_points
 
 
+# 工作进程内的扫描器实例（文件分类只依赖类级别的扩展名映射，与扫描配置无关）
+_worker_scanner: Optional[ProjectScanner] = None
+
+
+def _classify_scanned_file(job: Tuple[str, str, str]) -> Tuple[Optional[str], Dict[str, Any]]:
+    """
+    多进程扫描的工作函数：获取单个文件的信息并分类
+    
+    Args:
+        job: (文件完整路径, 项目根路径, 相对路径)
+        
+    Returns:
+        Tuple[Optional[str], Dict[str, Any]]: (分类, 文件信息)
+    """
+    global _worker_scanner
+    if _worker_scanner is None:
+        _worker_scanner = ProjectScanner()
+    return _worker_scanner._classify_file(*job)
+
+
 class ASTParser:
     """抽象语法树解析器，支持多种编程语言"""
     
-    def __init__(self):
-        """初始化AST解析器"""
+    # 各语言的注释行前缀
+    COMMENT_PREFIXES = {
+        Language.PYTHON: ('#', '"""', "'''"),
+        Language.JAVASCRIPT: ('//', '/*', '*'),
+        Language.TYPESCRIPT: ('//', '/*', '*'),
+        Language.JAVA: ('//', '/*', '*'),
+        Language.CPP: ('//', '/*', '*'),
+        Language.C: ('//', '/*', '*'),
+        Language.GO: ('//', '/*'),
+        Language.RUST: ('//', '/*', '///'),
+        Language.PHP: ('//', '/*', '#'),
+        Language.RUBY: ('#', '=begin'),
+        Language.CSHARP: ('//', '/*', '///')
+    }
+    
+    def __init__(self, cache_dir: Optional[str] = None, memo_size: int = 0):
+        """
+        初始化AST解析器
+        
+        Args:
+            cache_dir: Python解析结果的持久化缓存目录，为None时不启用缓存
+            memo_size: 内存中保留解析结果的文件数，默认为0即不启用；
+                只在同一文件会被反复解析时（如编辑器中重复分析）才值得开启
+        """
+        self.cache_dir = cache_dir
+        self.memo_size = memo_size
+        # (语言, 文件路径) -> (内容哈希, 序列化的解析结果)，按最近使用顺序排列。
+        # 保存序列化结果，命中时反序列化出新对象，调用方修改结果不会影响缓存
+        self._memo: OrderedDict = OrderedDict()
         self.parsers = {}
         self._init_parsers()
     
     def _init_parsers(self):
         """初始化各语言解析器"""
+        js_parser = JavaScriptASTParser()
         self.parsers = {
-            Language.PYTHON: PythonASTParser(),
-            Language.JAVASCRIPT: JavaScriptASTParser(),
-            Language.TYPESCRIPT: TypeScriptASTParser(),
+            Language.PYTHON: PythonASTParser(self.cache_dir),
+            Language.JAVASCRIPT: js_parser,
+            Language.TYPESCRIPT: TypeScriptASTParser(js_parser),
             Language.JAVA: JavaASTParser(),
             Language.CPP: CppASTParser(),
             Language.GO: GoASTParser(),
@@ -396,20 +694,35 @@ class ASTParser:
             logger.warning(f"不支持的语言: {language.value}")
             return None
         
+        # 同一文件内容未变时直接返回上次的结果（如编辑器中反复分析同一文件）
+        if self.memo_size:
+            memo_key = (language, file_path)
+            digest = _memo_digest(content.encode('utf-8', 'surrogatepass'))
+            memo = self._memo.get(memo_key)
+            if memo is not None and memo[0] == digest:
+                self._memo.move_to_end(memo_key)
+                return pickle.loads(memo[1])
+        
         try:
             result = parser.parse(content, file_path)
             
             # 添加文件元数据
             if result:
-                lines = content.splitlines()
+                total_lines, code_lines, comment_lines, blank_lines = self._count_lines(content, language)
                 result['metadata'] = {
                     'file_path': file_path,
                     'language': language.value,
-                    'total_lines': len(lines),
-                    'code_lines': self._count_code_lines(content),
-                    'comment_lines': self._count_comment_lines(content, language),
-                    'blank_lines': self._count_blank_lines(content)
+                    'total_lines': total_lines,
+                    'code_lines': code_lines,
+                    'comment_lines': comment_lines,
+                    'blank_lines': blank_lines
                 }
+                
+                if self.memo_size:
+                    self._memo[memo_key] = (digest, pickle.dumps(result, protocol=pickle.HIGHEST_PROTOCOL))
+                    self._memo.move_to_end(memo_key)
+                    if len(self._memo) > self.memo_size:
+                        self._memo.popitem(last=False)
             
             return result
             
@@ -417,58 +730,137 @@ class ASTParser:
             logger.error(f"解析失败 {file_path}: {e}")
             return None
     
-    def _count_code_lines(self, content: str) -> int:
-        """统计代码行数"""
-        lines = content.splitlines()
-        return sum(1 for line in lines if line.strip() and not self._is_comment_line(line))
-    
-    def _count_comment_lines(self, content: str, language: Language) -> int:
-        """统计注释行数"""
-        lines = content.splitlines()
-        return sum(1 for line in lines if self._is_comment_line(line, language))
+    def parse_many(self, files: List[Tuple[str, Language]],
+                   max_workers: Optional[int] = None) -> List[Union[Dict, None, Exception]]:
+        """
+        批量读取并解析源文件
+        
+        各文件的解析互不影响，文件较多时分发到多个进程执行，绕过GIL。
+        工作进程自行读取文件，只有解析结果需要跨进程传递。
+        
+        Args:
+            files: (文件路径, 编程语言) 列表
+            max_workers: 最大进程数，None 表示使用 CPU 核数，1 表示不并行
+            
+        Returns:
+            List[Union[Dict, None, Exception]]: 与 files 顺序一致的解析结果；
+            解析失败时为None，读取失败时为读取异常
+        """
+        # 单核机器上进程池只会增加序列化和进程启动的开销
+        if (max_workers or os.cpu_count() or 1) == 1 or len(files) < _PARALLEL_PARSE_MIN_FILES:
+            results = []
+            contents = read_source_files([file_path for file_path, _ in files])
+            for (file_path, language), (_, content) in zip(files, contents):
+                results.append(content if isinstance(content, Exception) else self.parse(file_path, content, language))
+            return results
+        
+        with concurrent.futures.ProcessPoolExecutor(max_workers=max_workers,
+                                                    initializer=_init_parse_worker,
+                                                    initargs=(self.cache_dir,)) as executor:
+            return list(executor.map(_parse_source_file, files, chunksize=16))
+    
+    def invalidate(self, file_path: str):
+        """
+        丢弃指定文件在内存中保留的解析结果
+        
+        Args:
+            file_path: 文件路径
+        """
+        for memo_key in [key for key in self._memo if key[1] == file_path]:
+            del self._memo[memo_key]
     
-    def _count_blank_lines(self, content: str) -> int:
-        """统计空行数"""
+    def _count_lines(self, content: str, language: Language) -> Tuple[int, int, int, int]:
+        """
+        单次遍历统计各类行数
+        
+        Args:
+            content: 文件内容
+            language: 编程语言（决定注释前缀）
+            
+        Returns:
+            Tuple[int, int, int, int]: (总行数, 代码行数, 注释行数, 空行数)
+        """
+        prefixes = self.COMMENT_PREFIXES.get(language, ('#',))
         lines = content.splitlines()
-        return sum(1 for line in lines if not line.strip())
-    
-    def _is_comment_line(self, line: str, language: Language = Language.PYTHON) -> bool:
-        """检查行是否为注释"""
-        line = line.strip()
-        
-        if not line:
-            return False
-        
-        comment_prefixes = {
-            Language.PYTHON: ('#', '"""', "'''"),
-            Language.JAVASCRIPT: ('//', '/*', '*'),
-            Language.TYPESCRIPT: ('//', '/*', '*'),
-            Language.JAVA: ('//', '/*', '*'),
-            Language.CPP: ('//', '/*', '*'),
-            Language.C: ('//', '/*', '*'),
-            Language.GO: ('//', '/*'),
-            Language.RUST: ('//', '/*', '///'),
-            Language.PHP: ('//', '/*', '#'),
-            Language.RUBY: ('#', '=begin'),
-            Language.CSHARP: ('//', '/*', '///')
-        }
+        comment_lines = 0
+        blank_lines = 0
         
-        prefixes = comment_prefixes.get(language, ('#',))
+        for line in lines:
+            line = line.strip()
+            if not line:
+                blank_lines += 1
+            elif line.startswith(prefixes):
+                comment_lines += 1
         
-        for prefix in prefixes:
-            if line.startswith(prefix):
-                return True
+        return len(lines), len(lines) - comment_lines - blank_lines, comment_lines, blank_lines
+
+
+# Python解析时需要处理的语法树节点类型，其余节点在遍历中直接跳过
+_PY_COLLECTED_NODES = (
+    ast.Assign, ast.ClassDef, ast.FunctionDef, ast.AsyncFunctionDef,
+    ast.Import, ast.ImportFrom,
+)
+
+# 函数定义节点类型（同步与异步）
+_PY_FUNCTION_NODES = (ast.FunctionDef, ast.AsyncFunctionDef)
+
+# 工作进程内的解析器，由 _init_parse_worker 创建
+_worker_parser: Optional[ASTParser] = None
+
+
+def _init_parse_worker(cache_dir: Optional[str]):
+    """
+    初始化解析工作进程
+    
+    Args:
+        cache_dir: Python解析结果的持久化缓存目录
+    """
+    global _worker_parser
+    # 每个文件只解析一次，内存缓存没有意义
+    _worker_parser = ASTParser(cache_dir, memo_size=0)
+
+
+def _parse_source_file(job: Tuple[str, Language]) -> Union[Dict, None, Exception]:
+    """
+    在工作进程中读取并解析单个文件
+    
+    Args:
+        job: (文件路径, 编程语言)
         
-        return False
+    Returns:
+        Union[Dict, None, Exception]: 解析结果；解析失败时为None，读取失败时为读取异常
+    """
+    file_path, language = job
+    content = _read_source_file(file_path)
+    if isinstance(content, Exception):
+        return content
+    return _worker_parser.parse(file_path, content, language)
+
+
+# 计入圈复杂度的分支节点类型
+_PY_BRANCH_NODES = (ast.If, ast.For, ast.While, ast.Assert,
+                    ast.With, ast.Try, ast.ExceptHandler)
 
 
 class PythonASTParser:
     """Python语言AST解析器"""
     
+    def __init__(self, cache_dir: Optional[str] = None):
+        """
+        初始化Python解析器
+        
+        Args:
+            cache_dir: 解析结果的持久化缓存目录，为None时不启用缓存
+        """
+        self.cache_dir = Path(cache_dir) if cache_dir else None
+    
     def parse(self, content: str, file_path: str) -> Dict[str, Any]:
         """
         解析Python源代码
         
+        启用缓存时，以文件路径和内容的SHA-256为键读取上次的解析结果，
+        未修改的文件无需重新解析。
+        
         Args:
             content: 文件内容
             file_path: 文件路径
@@ -476,6 +868,15 @@ class PythonASTParser:
         Returns:
             Dict[str, Any]: 解析结果
         """
+        cache_path = None
+        if self.cache_dir is not None:
+            cache_path = self._cache_path(content, file_path)
+            try:
+                with open(cache_path, 'rb') as f:
+                    return pickle.load(f)
+            except (OSError, pickle.UnpicklingError, EOFError):
+                pass
+        
         result = {
             'classes': [],
             'functions': [],
@@ -487,56 +888,135 @@ class PythonASTParser:
         }
         
         try:
-            tree = ast.parse(content)
-            
-            # 提取导入语句
-            self._extract_imports(tree, result)
-            
-            # 提取类定义
-            for node in ast.walk(tree):
-                if isinstance(node, ast.ClassDef):
-                    class_info = self._extract_class(node, file_path)
-                    result['classes'].append(class_info)
+            for kind, element in self.iter_elements(content, file_path):
+                result[kind].append(element)
+        except SyntaxError as e:
+            # 语法错误的结果不写入缓存，修复前每次运行都会报告错误
+            logger.error(f"Python语法错误 {file_path}: {e}")
+            return result
+        
+        if cache_path is not None:
+            _write_pickle(cache_path, result)
+        
+        return result
+    
+    def iter_elements(self, content: str, file_path: str) -> Iterator[Tuple[str, Dict[str, Any]]]:
+        """
+        逐个产出Python源代码中的代码元素，不经过缓存
+        
+        导入、变量和常量在遍历到时立即产出；类和函数的圈复杂度要到遍历结束才能确定，
+        因此在遍历完成后按发现顺序产出，最后产出注释。同一类别内的顺序与 parse 结果一致。
+        
+        Args:
+            content: 文件内容
+            file_path: 文件路径
             
-            # 提取函数定义
-            for node in ast.walk(tree):
-                if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
-                    if not self._is_method(node):
-                        func_info = self._extract_function(node, file_path)
-                        result['functions'].append(func_info)
+        Yields:
+            Tuple[str, Dict[str, Any]]: (元素类别, 元素信息)，类别与 parse 结果的键相同
             
-            # 提取变量和常量
-            self._extract_variables(tree, result)
+        Raises:
+            SyntaxError: 源代码存在语法错误（在产出任何元素之前抛出）
+        """
+        tree = ast.parse(content)
+        classes = []
+        functions = []
+        AST = ast.AST
+        # 类体中直接定义的函数节点（方法）到其提取结果的映射。遍历按广度优先进行，
+        # 类节点总是先于其方法被访问，因此遇到函数节点时即可判断是否为方法
+        method_infos = {}
+        
+        # 单次广度优先遍历语法树（顺序与 ast.walk 相同），按节点类型分别提取导入、类、
+        # 函数、变量和常量。队列中的每个节点附带其所有外层函数的提取结果，遇到分支节点时
+        # 直接累加这些函数的圈复杂度，无需再逐个函数重新遍历函数体
+        queue = deque([(tree, ())])
+        append = queue.append
+        extend = queue.extend
+        while queue:
+            node, owners = queue.popleft()
+            child_owners = owners
             
-            # 提取注释
-            result['comments'] = self._extract_comments(content)
+            if isinstance(node, _PY_BRANCH_NODES):
+                for info in owners:
+                    info['complexity'] += 1
+            # 大多数节点（表达式、名称等）不需要处理，先用一次类型检查过滤
+            elif isinstance(node, _PY_COLLECTED_NODES):
+                if isinstance(node, ast.Assign):
+                    yield from self._extract_variables(node)
+                elif isinstance(node, ast.ClassDef):
+                    class_info = self._extract_class(node, file_path)
+                    classes.append(class_info)
+                    method_nodes = [item for item in node.body if isinstance(item, _PY_FUNCTION_NODES)]
+                    method_infos.update(zip(map(id, method_nodes), class_info['methods']))
+                elif isinstance(node, _PY_FUNCTION_NODES):
+                    # 方法已随所属类提取，不再作为独立函数重复记录
+                    info = method_infos.get(id(node))
+                    if info is None:
+                        info = self._extract_function(node, file_path)
+                        functions.append(info)
+                    child_owners = owners + (info,)
+                else:
+                    for import_info in self._extract_imports(node):
+                        yield 'imports', import_info
             
-        except SyntaxError as e:
-            logger.error(f"Python语法错误 {file_path}: {e}")
+            # 按 _fields 顺序直接展开子节点，顺序与 ast.iter_child_nodes 相同，
+            # 但省去了其生成器和 ast.iter_fields 的逐层调用开销
+            for name in node._fields:
+                value = getattr(node, name, None)
+                if isinstance(value, list):
+                    extend([(item, child_owners) for item in value if isinstance(item, AST)])
+                elif isinstance(value, AST):
+                    append((value, child_owners))
+        
+        for class_info in classes:
+            yield 'classes', class_info
+        for function_info in functions:
+            yield 'functions', function_info
         
-        return result
+        # 提取注释
+        for comment in self._extract_comments(content):
+            yield 'comments', comment
     
-    def _extract_imports(self, tree, result):
-        """提取导入语句"""
-        for node in ast.walk(tree):
-            if isinstance(node, ast.Import):
-                for alias in node.names:
-                    result['imports'].append({
-                        'type': 'import',
-                        'module': alias.name,
-                        'alias': alias.asname,
-                        'line': node.lineno
-                    })
-            elif isinstance(node, ast.ImportFrom):
-                module = node.module or ''
-                for alias in node.names:
-                    result['imports'].append({
-                        'type': 'from_import',
-                        'module': module,
-                        'name': alias.name,
-                        'alias': alias.asname,
-                        'line': node.lineno
-                    })
+    def _cache_path(self, content: str, file_path: str) -> Path:
+        """
+        计算解析结果的缓存文件路径
+        
+        缓存键包含哈希算法、缓存格式版本和Python版本（不同版本的ast结构不同），
+        以及文件路径（结果中记录了file_path）和文件内容。安装了blake3时使用BLAKE3，
+        否则使用SHA-256；算法名参与计算，切换算法后旧缓存自然失效。
+        
+        Args:
+            content: 文件内容
+            file_path: 文件路径
+            
+        Returns:
+            Path: 缓存文件路径
+        """
+        hasher = _cache_hasher()
+        hasher.update(f"{hasher.name}:{_PARSE_CACHE_VERSION}:{sys.version_info[:2]}:{file_path}\0".encode('utf-8'))
+        hasher.update(content.encode('utf-8', 'surrogatepass'))
+        key = hasher.hexdigest()
+        return self.cache_dir / key[:2] / key[2:]
+    
+    def _extract_imports(self, node) -> Iterator[Dict]:
+        """提取导入语句（ast.Import 或 ast.ImportFrom 节点）"""
+        if isinstance(node, ast.Import):
+            for alias in node.names:
+                yield {
+                    'type': 'import',
+                    'module': alias.name,
+                    'alias': alias.asname,
+                    'line': node.lineno
+                }
+        else:
+            module = node.module or ''
+            for alias in node.names:
+                yield {
+                    'type': 'from_import',
+                    'module': module,
+                    'name': alias.name,
+                    'alias': alias.asname,
+                    'line': node.lineno
+                }
     
     def _extract_class(self, node: ast.ClassDef, file_path: str) -> Dict[str, Any]:
         """提取类定义信息"""
@@ -545,7 +1025,7 @@ class PythonASTParser:
         decorators = []
         
         for item in node.body:
-            if isinstance(item, ast.FunctionDef):
+            if isinstance(item, _PY_FUNCTION_NODES):
                 method_info = self._extract_method(item, file_path)
                 methods.append(method_info)
             elif isinstance(item, ast.Assign):
@@ -592,7 +1072,8 @@ class PythonASTParser:
             'parameters': self._extract_parameters(node.args),
             'return_type': self._get_type_string(node.returns) if node.returns else None,
             'decorators': self._extract_decorators(node.decorator_list),
-            'complexity': self._calculate_complexity(node),
+            # 圈复杂度初始为1，由 _parse 遍历函数体时按分支节点累加
+            'complexity': 1,
             'file_path': file_path,
             'is_async': isinstance(node, ast.AsyncFunctionDef)
         }
@@ -615,35 +1096,31 @@ class PythonASTParser:
         """提取函数参数列表"""
         parameters = []
         
-        for arg in args.args:
+        # defaults 只包含有默认值的参数，且与参数列表末尾对齐
+        defaults = args.defaults
+        first_default = len(args.args) - len(defaults)
+        
+        for i, arg in enumerate(args.args):
             param_info = {
                 'name': arg.arg,
                 'type': self._get_type_string(arg.annotation) if arg.annotation else None,
-                'default': self._get_default_value(args.defaults, args.args.index(arg)) if args.defaults else None
+                'default': ast.unparse(defaults[i - first_default]) if i >= first_default else None
             }
             parameters.append(param_info)
         
         return parameters
     
-    def _extract_variables(self, tree, result):
-        """提取变量和常量定义"""
-        for node in ast.walk(tree):
-            if isinstance(node, ast.Assign):
-                for target in node.targets:
-                    if isinstance(target, ast.Name):
-                        # 检查是否为常量（大写命名）
-                        if target.id.isupper() and len(target.id) > 1:
-                            result['constants'].append({
-                                'name': target.id,
-                                'value': self._get_value(node.value),
-                                'line': node.lineno
-                            })
-                        else:
-                            result['variables'].append({
-                                'name': target.id,
-                                'value': self._get_value(node.value),
-                                'line': node.lineno
-                            })
+    def _extract_variables(self, node: ast.Assign) -> Iterator[Tuple[str, Dict]]:
+        """提取赋值语句中的变量和常量定义，产出 (类别, 定义信息)"""
+        for target in node.targets:
+            if isinstance(target, ast.Name):
+                # 检查是否为常量（大写命名）
+                kind = 'constants' if target.id.isupper() and len(target.id) > 1 else 'variables'
+                yield kind, {
+                    'name': target.id,
+                    'value': self._get_value(node.value),
+                    'line': node.lineno
+                }
     
     def _extract_decorators(self, decorator_list: List) -> List[str]:
         """提取装饰器列表"""
@@ -709,12 +1186,13 @@ class PythonASTParser:
     
     def _get_value(self, node) -> Any:
         """获取节点的值"""
+        # Python 3.8起 ast.parse 只生成 ast.Constant，不再出现 ast.Str/ast.Num
         if isinstance(node, ast.Constant):
-            return node.value
-        elif isinstance(node, ast.Str):
-            return node.s
-        elif isinstance(node, ast.Num):
-            return node.n
+            value = node.value
+            # bytes、Ellipsis、复数等无法直接编码为JSON，按源码形式记录
+            if value is None or isinstance(value, (str, int, float)):
+                return value
+            return ast.unparse(node)
         elif isinstance(node, ast.Name):
             return f"'{node.id}'"
         elif isinstance(node, ast.Dict):
@@ -724,36 +1202,273 @@ class PythonASTParser:
         elif isinstance(node, ast.Tuple):
             return ()
         return None
+
+
+# 参数列表中的单个参数：括号、方括号、花括号和尖括号内的逗号不作为分隔符
+# （如 std::map<K, V> m、opts = {a: 1, b: 2}），未闭合的括号按普通字符处理
+_PARAM_PATTERN = re.compile(r'(?:[^,(\[{<]+|\([^)]*\)|\[[^\]]*\]|\{[^}]*\}|<[^>]*>|[(\[{<])+')
+
+
+def _split_params(params_str: str) -> List[str]:
+    """
+    按顶层逗号切分参数列表
+    
+    不含括号的参数列表（最常见的情况）直接用 str.split 切分，否则使用 _PARAM_PATTERN。
     
-    def _get_default_value(self, defaults: List, param_index: int) -> Any:
-        """获取参数默认值"""
-        if not defaults:
+    Args:
+        params_str: 参数列表字符串（不含外层括号）
+        
+    Returns:
+        List[str]: 去除首尾空白的各参数，可能包含空字符串
+    """
+    if '(' in params_str or '<' in params_str or '[' in params_str or '{' in params_str:
+        return [match.group().strip() for match in _PARAM_PATTERN.finditer(params_str)]
+    return [param.strip() for param in params_str.split(',')]
+
+
+def _comment_lines(content: str, prefixes: Tuple[str, ...]) -> Iterator[Tuple[int, str, str]]:
+    """
+    筛选去除首尾空白后以指定前缀开头的行
+    
+    去空白和前缀判断都在 map 中以C实现完成，Python循环只需处理可能是注释的少数行。
+    
+    Args:
+        content: 文件内容
+        prefixes: 行首前缀
+        
+    Returns:
+        Iterator[Tuple[int, str, str]]: (行号, 原始行, 去除首尾空白后的行) 迭代器
+    """
+    lines = content.splitlines()
+    stripped_lines = list(map(str.strip, lines))
+    return compress(zip(count(1), lines, stripped_lines), map(str.startswith, stripped_lines, repeat(prefixes)))
+
+
+def _search_line_start(pattern: re.Pattern, content: str, keyword: str) -> Optional[re.Match]:
+    """
+    查找第一个以关键字开头、且从行首匹配 pattern 的行
+    
+    结果与 pattern.search(content) 相同（pattern 须为以 ^keyword 开头的 MULTILINE 模式），
+    但只在 str.find 找到的行首关键字处尝试匹配；关键字不存在时无需逐字符扫描整个文件。
+    
+    Args:
+        pattern: 以 ^keyword 开头的 MULTILINE 正则表达式
+        content: 文件内容
+        keyword: 行首关键字
+        
+    Returns:
+        Optional[re.Match]: 第一个匹配，不存在时为None
+    """
+    needle = '\n' + keyword
+    start = 0
+    if not content.startswith(keyword):
+        start = content.find(needle) + 1
+        if not start:
+            return None
+    
+    while True:
+        match = pattern.match(content, start)
+        if match:
+            return match
+        start = content.find(needle, start) + 1
+        if not start:
             return None
+
+
+class _LineIndex:
+    """行号索引：一次性记录文件内所有换行位置，按字符偏移二分查找所在行号"""
+    
+    __slots__ = ('newlines',)
+    
+    def __init__(self, content: str):
+        """
+        初始化行号索引
+        
+        Args:
+            content: 文件内容
+        """
+        self.newlines = [match.start() for match in _NEWLINE_PATTERN.finditer(content)]
+    
+    def line_of(self, offset: int) -> int:
+        """
+        获取字符偏移所在的行号
         
-        # defaults列表只包含有默认值的参数
-        # 位置从后往前计算
-        num_with_default = len(defaults)
-        num_params = len(defaults) + sum(1 for arg in defaults if arg is not None)
+        Args:
+            offset: 字符偏移
+            
+        Returns:
+            int: 行号（从1开始）
+        """
+        return bisect.bisect_left(self.newlines, offset) + 1
+
+
+def _mask(match: re.Match) -> str:
+    """
+    返回与匹配等长的替换串
+    
+    注释（以'/'开头）等同于空白，替换为空格；字符串字面量仍是一个非空白的表达式，
+    替换为引号，避免被声明正则中的 \\s* 吞掉（如 x = "a" 的值不会变成空白）。
+    """
+    text = match.group()
+    return (' ' if text[0] == '/' else '"') * len(text)
+
+
+def _mask_strings_and_comments(content: str, pattern: re.Pattern) -> str:
+    """
+    将注释和字符串字面量替换为等长的空格或引号
+    
+    替换前后长度不变，在结果上匹配得到的偏移可直接用于原始内容和行号索引；
+    声明正则不会再匹配到注释或字符串中的关键字（如被注释掉的代码）。
+    
+    Args:
+        content: 文件内容
+        pattern: 匹配该语言字符串字面量和注释的正则表达式
         
-        return None
+    Returns:
+        str: 屏蔽字符串和注释后的内容
+    """
+    return pattern.sub(_mask, content)
+
+
+# 屏蔽后文本中由字符串字面量替换成的连续引号
+_MASKED_STRING_PATTERN = re.compile(r'"+')
+
+
+def _restore_strings(code: str, content: str) -> str:
+    """
+    按相同偏移从原始文本恢复屏蔽掉的字符串字面量，注释仍保持为空白
+    
+    用于从声明体中截取值（如字面量类型、默认值）：结构按屏蔽后的文本解析，
+    值中的字符串内容取自原始文本，不会混入注释。
     
-    def _calculate_complexity(self, node: ast.FunctionDef) -> int:
-        """计算圈复杂度"""
-        complexity = 1
+    Args:
+        code: 屏蔽后的文本片段
+        content: 原始文本中相同偏移的片段
         
-        for child in ast.walk(node):
-            if isinstance(child, (ast.If, ast.For, ast.While, ast.Assert,
-                                 ast.With, ast.Try, ast.ExceptHandler)):
-                complexity += 1
+    Returns:
+        str: 恢复字符串后的文本
+    """
+    if '"' not in code:
+        return code
+    parts = []
+    pos = 0
+    for match in _MASKED_STRING_PATTERN.finditer(code):
+        start, end = match.span()
+        parts.append(code[pos:start])
+        parts.append(content[start:end])
+        pos = end
+    parts.append(code[pos:])
+    return ''.join(parts)
+
+
+class _SourceMatch:
+    """在屏蔽后的内容上得到的匹配，分组文本按相同偏移从原始内容中截取"""
+    
+    __slots__ = ('match', 'content')
+    
+    def __init__(self, match: re.Match, content: str):
+        """
+        初始化匹配
         
-        return complexity
+        Args:
+            match: 在屏蔽后的内容上得到的匹配
+            content: 原始文件内容
+        """
+        self.match = match
+        self.content = content
     
-    def _is_method(self, node: ast.FunctionDef) -> bool:
-        """检查函数是否在类内部"""
-        # Python AST中，方法会在ClassDef的body中
-        # 但这里使用ast.walk，所以需要通过检查父节点来判断
-        # 简化处理：如果函数名以下划线开头，认为是内部方法
-        return False
+    def start(self) -> int:
+        """获取匹配的起始偏移"""
+        return self.match.start()
+    
+    def group(self, index: int = 0) -> Optional[str]:
+        """
+        获取分组在原始内容中的文本
+        
+        Args:
+            index: 分组序号
+            
+        Returns:
+            Optional[str]: 分组文本，分组未参与匹配时为None
+        """
+        start, end = self.match.span(index)
+        return self.content[start:end] if start >= 0 else None
+    
+    def code_group(self, index: int = 0) -> Optional[str]:
+        """
+        获取分组在屏蔽后内容中的文本
+        
+        声明体需要继续拆分为成员时使用：注释已替换为空白，不会被当作成员解析。
+        
+        Args:
+            index: 分组序号
+            
+        Returns:
+            Optional[str]: 分组文本，分组未参与匹配时为None
+        """
+        return self.match.group(index)
+
+
+def _keyword_finditer(pattern: re.Pattern, text: str, keyword: str) -> Iterator[re.Match]:
+    """
+    以关键字开头的正则表达式的 finditer
+    
+    结果与 pattern.finditer(text) 相同，但先用 str.find 定位关键字，只在关键字处尝试匹配；
+    关键字较少出现时比正则引擎逐段扫描快，不出现时只需一次 find。
+    
+    Args:
+        pattern: 以字面关键字 keyword 开头、不会匹配空串的正则表达式
+        text: 待匹配文本
+        keyword: 关键字
+        
+    Yields:
+        re.Match: 互不重叠的各个匹配
+    """
+    find = text.find
+    start = find(keyword)
+    while start >= 0:
+        match = pattern.match(text, start)
+        if match:
+            yield match
+            start = find(keyword, match.end())
+        else:
+            start = find(keyword, start + 1)
+
+
+def _source_matches(pattern: re.Pattern, code: str, content: str,
+                    keyword: Optional[str] = None) -> Iterator[_SourceMatch]:
+    """
+    在屏蔽后的内容上查找声明，分组文本取自原始内容（保留字符串默认值等）
+    
+    Args:
+        pattern: 声明正则表达式
+        code: 屏蔽字符串和注释后的内容
+        content: 原始文件内容
+        keyword: pattern 开头的字面关键字，提供时按关键字定位匹配（见 _keyword_finditer）
+        
+    Yields:
+        _SourceMatch: 各个匹配
+    """
+    matches = pattern.finditer(code) if keyword is None else _keyword_finditer(pattern, code, keyword)
+    for match in matches:
+        yield _SourceMatch(match, content)
+
+
+# JavaScript 解析用的正则表达式（模块加载时编译一次）
+# ES6 import 与 require 合并为一个交替模式，每个文件只需扫描一次导入语句
+_JS_IMPORT_PATTERN = re.compile(
+    r'import\s+(?:\{[^}]+\}|\* as \w+|\w+)\s+from\s+[\'"]([^\'"]+)[\'"]'
+    r'|require\([\'"]([^\'"]+)[\'"]\)'
+)
+_JS_FUNCTION_PATTERN = re.compile(r'function\s+(\w+)\s*\(([^)]*)\)')
+_JS_ARROW_FUNCTION_PATTERN = re.compile(r'(?:const|let|var)\s+(\w+)\s*=\s*(?:async\s*)?\(([^)]*)\)\s*=>')
+_JS_CLASS_PATTERN = re.compile(r'class\s+(\w+)(?:\s+extends\s+(\w+))?(?:\s+implements\s+([^{]+))?\{')
+_JS_VARIABLE_PATTERN = re.compile(r'(?:const|let|var)\s+(\w+)(?:\s*=\s*([^;]+))?')
+# 注释、单双引号字符串和模板字符串（不处理正则字面量和模板中的嵌套插值）
+_JS_MASK_PATTERN = re.compile(
+    r'//[^\n]*|/\*[\s\S]*?\*/'
+    r'|"(?:\\[\s\S]|[^"\\\n])*"|\'(?:\\[\s\S]|[^\'\\\n])*\'|`(?:\\[\s\S]|[^`\\])*`'
+)
 
 
 class JavaScriptASTParser:
@@ -780,41 +1495,53 @@ class JavaScriptASTParser:
             'comments': []
         }
         
+        # 所有匹配共用一份行号索引，避免每次匹配都从文件开头统计换行
+        line_index = _LineIndex(content)
+        # 屏蔽注释和字符串后再匹配声明，替换前后等长，偏移与原始内容一致
+        code = _mask_strings_and_comments(content, _JS_MASK_PATTERN)
+        
         # 提取注释
-        result['comments'] = self._extract_comments(content)
+        result['comments'] = list(self._extract_comments(content))
         
         # 提取导入语句
-        result['imports'] = self._extract_imports(content)
+        result['imports'] = list(self._extract_imports(content, line_index))
         
         # 提取函数
-        result['functions'] = self._extract_functions(content, file_path)
+        result['functions'] = list(self._extract_functions(content, code, file_path, line_index))
         
         # 提取类
-        result['classes'] = self._extract_classes(content, file_path)
+        result['classes'] = list(self._extract_classes(content, code, file_path, line_index))
         
         # 提取变量
-        result['variables'] = self._extract_variables(content)
+        result['variables'] = list(self._extract_variables(content, code, line_index))
         
         return result
     
-    def _extract_comments(self, content: str) -> List[Dict]:
+    def _extract_comments(self, content: str) -> Iterator[Dict]:
         """提取注释"""
-        comments = []
         lines = content.splitlines()
         
         in_multiline = False
         current_multiline = []
+        processed = 0
         
-        for i, line in enumerate(lines, 1):
+        # 不含'/'的行既不是单行注释，也不会开始或结束多行注释，循环只处理含'/'的行
+        for i in compress(count(1), map(contains, lines, repeat('/'))):
+            line = lines[i - 1]
+            if in_multiline:
+                # 跳过的行都是多行注释的中间行
+                current_multiline.extend(map(str.strip, lines[processed:i - 1]))
+            processed = i
+            
             # 单行注释
             if '//' in line and not in_multiline:
                 comment_text = line.split('//')[1].strip()
                 if comment_text:
-                    comments.append({
+                    yield {
                         'line': i,
                         'type': 'single',
                         'content': comment_text
-                    })
+                    }
             
             # 多行注释开始
             if '/*' in line:
@@ -827,135 +1554,122 @@ class JavaScriptASTParser:
                 if '*/' in line:
                     end = line.find('*/')
                     current_multiline.append(line[:end].strip())
-                    comments.append({
+                    yield {
                         'line': i,
                         'type': 'multi',
                         'content': ' '.join(current_multiline)
-                    })
+                    }
                     in_multiline = False
                     current_multiline = []
                 else:
                     current_multiline.append(line.strip())
-        
-        return comments
     
-    def _extract_imports(self, content: str) -> List[Dict]:
+    def _extract_imports(self, content: str, line_index: _LineIndex) -> Iterator[Dict]:
         """提取导入语句"""
-        imports = []
-        
-        # ES6 import
-        import_pattern = r'import\s+(?:\{[^}]+\}|\* as \w+|\w+)\s+from\s+[\'"]([^\'"]+)[\'"]'
-        for match in re.finditer(import_pattern, content):
-            imports.append({
-                'type': 'import',
-                'module': match.group(1),
-                'line': content[:match.start()].count('\n') + 1
-            })
-        
-        # require语句
-        require_pattern = r'require\([\'"]([^\'"]+)[\'"]\)'
-        for match in re.finditer(require_pattern, content):
-            imports.append({
-                'type': 'require',
-                'module': match.group(1),
-                'line': content[:match.start()].count('\n') + 1
-            })
-        
-        return imports
+        # ES6 import（第1组）或 require 语句（第2组），按出现顺序记录
+        for match in _JS_IMPORT_PATTERN.finditer(content):
+            es_module, required_module = match.groups()
+            if es_module is not None:
+                yield {
+                    'type': 'import',
+                    'module': es_module,
+                    'line': line_index.line_of(match.start())
+                }
+            else:
+                yield {
+                    'type': 'require',
+                    'module': required_module,
+                    'line': line_index.line_of(match.start())
+                }
     
-    def _extract_functions(self, content: str, file_path: str) -> List[Dict]:
+    def _extract_functions(self, content: str, code: str, file_path: str, line_index: _LineIndex) -> Iterator[Dict]:
         """提取函数定义"""
-        functions = []
-        
         # 函数声明
-        func_pattern = r'function\s+(\w+)\s*\(([^)]*)\)'
-        for match in re.finditer(func_pattern, content):
+        for match in _source_matches(_JS_FUNCTION_PATTERN, code, content):
             func_name = match.group(1)
             params = self._parse_params(match.group(2))
-            line = content[:match.start()].count('\n') + 1
+            line = line_index.line_of(match.start())
             
-            functions.append({
+            yield {
                 'name': func_name,
                 'line_number': line,
                 'parameters': params,
                 'type': 'function_declaration',
                 'file_path': file_path
-            })
+            }
         
         # 箭头函数
-        arrow_pattern = r'(?:const|let|var)\s+(\w+)\s*=\s*(?:async\s*)?\(([^)]*)\)\s*=>'
-        for match in re.finditer(arrow_pattern, content):
+        for match in _source_matches(_JS_ARROW_FUNCTION_PATTERN, code, content):
             func_name = match.group(1)
             params = self._parse_params(match.group(2))
-            line = content[:match.start()].count('\n') + 1
+            line = line_index.line_of(match.start())
             
-            functions.append({
+            yield {
                 'name': func_name,
                 'line_number': line,
                 'parameters': params,
                 'type': 'arrow_function',
                 'file_path': file_path
-            })
-        
-        return functions
+            }
     
-    def _extract_classes(self, content: str, file_path: str) -> List[Dict]:
+    def _extract_classes(self, content: str, code: str, file_path: str, line_index: _LineIndex) -> Iterator[Dict]:
         """提取类定义"""
-        classes = []
-        
-        class_pattern = r'class\s+(\w+)(?:\s+extends\s+(\w+))?(?:\s+implements\s+([^{]+))?\{'
-        for match in re.finditer(class_pattern, content):
+        for match in _source_matches(_JS_CLASS_PATTERN, code, content):
             class_info = {
                 'name': match.group(1),
-                'line_number': content[:match.start()].count('\n') + 1,
+                'line_number': line_index.line_of(match.start()),
                 'base_classes': [match.group(2)] if match.group(2) else [],
                 'implements': [c.strip() for c in match.group(3).split(',')] if match.group(3) else [],
                 'methods': [],
                 'file_path': file_path
             }
-            classes.append(class_info)
-        
-        return classes
+            yield class_info
     
-    def _extract_variables(self, content: str) -> List[Dict]:
+    def _extract_variables(self, content: str, code: str, line_index: _LineIndex) -> Iterator[Dict]:
         """提取变量定义"""
-        variables = []
-        
         # const/let/var声明
-        var_pattern = r'(?:const|let|var)\s+(\w+)(?:\s*=\s*([^;]+))?'
-        for match in re.finditer(var_pattern, content):
+        for match in _source_matches(_JS_VARIABLE_PATTERN, code, content):
             var_name = match.group(1)
             # 排除函数名
             if not var_name in ['function', 'class', 'if', 'for', 'while', 'switch']:
-                variables.append({
+                yield {
                     'name': var_name,
                     'value': match.group(2).strip() if match.group(2) else None,
-                    'line': content[:match.start()].count('\n') + 1
-                })
-        
-        return variables
+                    'line': line_index.line_of(match.start())
+                }
     
     def _parse_params(self, params_str: str) -> List[Dict]:
         """解析参数列表"""
         params = []
-        if params_str.strip():
-            for param in params_str.split(','):
-                param = param.strip()
-                if param:
-                    parts = param.split('=')
-                    params.append({
-                        'name': parts[0].strip(),
-                        'default': parts[1].strip() if len(parts) > 1 else None
-                    })
+        for param in _split_params(params_str):
+            if param:
+                # 只按第一个'='切分，默认值本身可以包含'='（如 cb = () => x）
+                name, sep, default = param.partition('=')
+                params.append({
+                    'name': name.strip(),
+                    'default': default.strip() if sep else None
+                })
         return params
 
 
+# TypeScript 解析用的正则表达式（模块加载时编译一次）
+_TS_INTERFACE_PATTERN = re.compile(r'interface\s+(\w+)(?:<[^>]+>)?\s*\{([^}]+)\}')
+_TS_TYPE_ALIAS_PATTERN = re.compile(r'type\s+(\w+)\s*=\s*([^{;]+)')
+_TS_GENERIC_PATTERN = re.compile(r'(?:class|interface|type|function)\s+(\w+)\s*<([^>]+)>')
+_TS_PROPERTY_PATTERN = re.compile(r'(\w+)(\??)\s*:\s*([^;]+)')
+
+
 class TypeScriptASTParser:
     """TypeScript语言AST解析器"""
     
-    def __init__(self):
-        """初始化TypeScript解析器"""
-        self.js_parser = JavaScriptASTParser()
+    def __init__(self, js_parser: Optional[JavaScriptASTParser] = None):
+        """
+        初始化TypeScript解析器
+        
+        Args:
+            js_parser: 用于解析JavaScript部分的解析器，为None时新建（解析器无状态，可共用）
+        """
+        self.js_parser = js_parser or JavaScriptASTParser()
     
     def parse(self, content: str, file_path: str) -> Dict[str, Any]:
         """
@@ -970,72 +1684,85 @@ class TypeScriptASTParser:
         """
         result = self.js_parser.parse(content, file_path)
         
+        # 所有匹配共用一份行号索引，避免每次匹配都从文件开头统计换行
+        line_index = _LineIndex(content)
+        # 屏蔽注释和字符串后再匹配声明，替换前后等长，偏移与原始内容一致
+        code = _mask_strings_and_comments(content, _JS_MASK_PATTERN)
+        
         # 提取TypeScript特有结构
-        result['interfaces'] = self._extract_interfaces(content, file_path)
-        result['type_aliases'] = self._extract_type_aliases(content, file_path)
-        result['generics'] = self._extract_generics(content)
+        result['interfaces'] = list(self._extract_interfaces(content, code, file_path, line_index))
+        result['type_aliases'] = list(self._extract_type_aliases(content, code, file_path, line_index))
+        result['generics'] = list(self._extract_generics(content, code))
         
         return result
     
-    def _extract_interfaces(self, content: str, file_path: str) -> List[Dict]:
+    def _extract_interfaces(self, content: str, code: str, file_path: str, line_index: _LineIndex) -> Iterator[Dict]:
         """提取接口定义"""
-        interfaces = []
-        
-        interface_pattern = r'interface\s+(\w+)(?:<[^>]+>)?\s*\{([^}]+)\}'
-        for match in re.finditer(interface_pattern, content):
+        for match in _source_matches(_TS_INTERFACE_PATTERN, code, content, 'interface'):
             interface_info = {
                 'name': match.group(1),
-                'line_number': content[:match.start()].count('\n') + 1,
-                'properties': self._parse_interface_body(match.group(2)),
+                'line_number': line_index.line_of(match.start()),
+                'properties': self._parse_interface_body(match.code_group(2), match.group(2)),
                 'file_path': file_path
             }
-            interfaces.append(interface_info)
-        
-        return interfaces
+            yield interface_info
     
-    def _extract_type_aliases(self, content: str, file_path: str) -> List[Dict]:
+    def _extract_type_aliases(self, content: str, code: str, file_path: str, line_index: _LineIndex) -> Iterator[Dict]:
         """提取类型别名"""
-        type_aliases = []
-        
-        type_pattern = r'type\s+(\w+)\s*=\s*([^{;]+)'
-        for match in re.finditer(type_pattern, content):
-            type_aliases.append({
+        for match in _source_matches(_TS_TYPE_ALIAS_PATTERN, code, content):
+            yield {
                 'name': match.group(1),
                 'definition': match.group(2).strip(),
-                'line_number': content[:match.start()].count('\n') + 1,
+                'line_number': line_index.line_of(match.start()),
                 'file_path': file_path
-            })
-        
-        return type_aliases
+            }
     
-    def _extract_generics(self, content: str) -> List[Dict]:
+    def _extract_generics(self, content: str, code: str) -> Iterator[Dict]:
         """提取泛型定义"""
-        generics = []
-        
-        generic_pattern = r'(?:class|interface|type|function)\s+(\w+)\s*<([^>]+)>'
-        for match in re.finditer(generic_pattern, content):
-            generics.append({
+        for match in _source_matches(_TS_GENERIC_PATTERN, code, content):
+            yield {
                 'name': match.group(1),
                 'type_params': [p.strip() for p in match.group(2).split(',')]
-            })
-        
-        return generics
+            }
     
-    def _parse_interface_body(self, body: str) -> List[Dict]:
-        """解析接口体"""
+    def _parse_interface_body(self, body: str, raw_body: str) -> List[Dict]:
+        """
+        解析接口体
+        
+        Args:
+            body: 屏蔽字符串和注释后的接口体
+            raw_body: 原始接口体（与 body 等长，用于恢复字面量类型中的字符串）
+            
+        Returns:
+            List[Dict]: 属性列表
+        """
         properties = []
         
-        prop_pattern = r'(\w+)(\??)\s*:\s*([^;]+)'
-        for match in re.finditer(prop_pattern, body):
+        for match in _TS_PROPERTY_PATTERN.finditer(body):
+            start, end = match.span(3)
             properties.append({
                 'name': match.group(1),
                 'optional': bool(match.group(2)),
-                'type': match.group(3).strip()
+                'type': _restore_strings(match.group(3), raw_body[start:end]).strip()
             })
         
         return properties
 
 
+# Java 解析用的正则表达式（模块加载时编译一次）
+_JAVA_IMPORT_PATTERN = re.compile(r'import\s+([\w.]+(?:\.\*)?)\s*;')
+_JAVA_CLASS_PATTERN = re.compile(r'class\s+(\w+)(?:\s+extends\s+(\w+))?(?:\s+implements\s+([^{]+))?\{')
+_JAVA_INTERFACE_PATTERN = re.compile(r'interface\s+(\w+)(?:\s+extends\s+([^{]+))?\{')
+_JAVA_ENUM_PATTERN = re.compile(r'enum\s+(\w+)(?:\s+implements\s+([^{]+))?\{')
+_JAVA_ENUM_VALUE_PATTERN = re.compile(r'(\w+)(?:\([^)]*\))?(?:,|\s*\})')
+# 注释、文本块、字符串和字符字面量
+_JAVA_MASK_PATTERN = re.compile(
+    r'//[^\n]*|/\*[\s\S]*?\*/'
+    r'|"""[\s\S]*?"""|"(?:\\[\s\S]|[^"\\\n])*"|\'(?:\\[\s\S]|[^\'\\\n])*\''
+)
+_JAVA_FIELD_PATTERN = re.compile(r'(?:public|private|protected)(?:\s+(?:static|final|transient|volatile))*\s+([\w.<>]+)\s+(\w+)(?:\s*=\s*([^;]+))?\s*;')
+
+
 class JavaASTParser:
     """Java语言AST解析器"""
     
@@ -1061,156 +1788,148 @@ class JavaASTParser:
             'comments': []
         }
         
+        # 所有匹配共用一份行号索引，避免每次匹配都从文件开头统计换行
+        line_index = _LineIndex(content)
+        # 屏蔽注释和字符串后再匹配声明，替换前后等长，偏移与原始内容一致
+        code = _mask_strings_and_comments(content, _JAVA_MASK_PATTERN)
+        
         # 提取注释
-        result['comments'] = self._extract_comments(content)
+        result['comments'] = list(self._extract_comments(content))
         
         # 提取导入语句
-        result['imports'] = self._extract_imports(content)
+        result['imports'] = list(self._extract_imports(content, line_index))
         
         # 提取类
-        result['classes'] = self._extract_classes(content, file_path)
+        result['classes'] = list(self._extract_classes(content, code, file_path, line_index))
         
         # 提取接口
-        result['interfaces'] = self._extract_interfaces(content, file_path)
+        result['interfaces'] = list(self._extract_interfaces(content, code, file_path, line_index))
         
         # 提取枚举
-        result['enums'] = self._extract_enums(content, file_path)
+        result['enums'] = list(self._extract_enums(content, code, file_path, line_index))
         
         # 提取字段
-        result['fields'] = self._extract_fields(content)
+        result['fields'] = list(self._extract_fields(content, code, line_index))
         
         return result
     
-    def _extract_comments(self, content: str) -> List[Dict]:
+    def _extract_comments(self, content: str) -> Iterator[Dict]:
         """提取注释"""
-        comments = []
-        lines = content.splitlines()
-        
         in_javadoc = False
         current_javadoc = []
         
-        for i, line in enumerate(lines, 1):
-            stripped = line.strip()
-            
+        # 只有以'/'或'*'开头的行会改变状态或产生注释，其余行直接跳过
+        for i, line, stripped in _comment_lines(content, ('/', '*')):
             if stripped.startswith('/**') and '*' in stripped[3:]:
                 in_javadoc = True
                 start = stripped.find('*') + 1
                 current_javadoc = [line[start:].strip()]
             elif in_javadoc:
                 if stripped.startswith('*/'):
-                    comments.append({
+                    yield {
                         'line': i,
                         'type': 'javadoc',
                         'content': '\n'.join(current_javadoc)
-                    })
+                    }
                     in_javadoc = False
                     current_javadoc = []
                 elif stripped.startswith('*'):
                     current_javadoc.append(stripped[1:].strip())
             elif stripped.startswith('//'):
                 if stripped.startswith('///'):
-                    comments.append({
+                    yield {
                         'line': i,
                         'type': 'doc_comment',
                         'content': stripped[3:].strip()
-                    })
+                    }
                 else:
-                    comments.append({
+                    yield {
                         'line': i,
                         'type': 'single',
                         'content': stripped[2:].strip()
-                    })
-        
-        return comments
+                    }
     
-    def _extract_imports(self, content: str) -> List[Dict]:
+    def _extract_imports(self, content: str, line_index: _LineIndex) -> Iterator[Dict]:
         """提取导入语句"""
-        imports = []
-        
-        import_pattern = r'import\s+([\w.]+(?:\.\*)?)\s*;'
-        for match in re.finditer(import_pattern, content):
-            imports.append({
+        for match in _JAVA_IMPORT_PATTERN.finditer(content):
+            yield {
                 'type': 'import',
-                'module': match.group(1),
-                'line': content[:match.start()].count('\n') + 1
-            })
-        
-        return imports
+                'module': match.group(1),
+                'line': line_index.line_of(match.start())
+            }
     
-    def _extract_classes(self, content: str, file_path: str) -> List[Dict]:
+    def _extract_classes(self, content: str, code: str, file_path: str, line_index: _LineIndex) -> Iterator[Dict]:
         """提取类定义"""
-        classes = []
-        
-        class_pattern = r'(?:public\s+)?(?:abstract\s+)?class\s+(\w+)(?:\s+extends\s+(\w+))?(?:\s+implements\s+([^{]+))?\{'
-        for match in re.finditer(class_pattern, content):
-            classes.append({
+        for match in _source_matches(_JAVA_CLASS_PATTERN, code, content, 'class'):
+            yield {
                 'name': match.group(1),
-                'line_number': content[:match.start()].count('\n') + 1,
+                'line_number': line_index.line_of(match.start()),
                 'base_class': match.group(2),
                 'interfaces': [i.strip() for i in match.group(3).split(',')] if match.group(3) else [],
                 'methods': [],
                 'fields': [],
                 'file_path': file_path
-            })
-        
-        return classes
+            }
     
-    def _extract_interfaces(self, content: str, file_path: str) -> List[Dict]:
+    def _extract_interfaces(self, content: str, code: str, file_path: str, line_index: _LineIndex) -> Iterator[Dict]:
         """提取接口定义"""
-        interfaces = []
-        
-        interface_pattern = r'(?:public\s+)?interface\s+(\w+)(?:\s+extends\s+([^{]+))?\{'
-        for match in re.finditer(interface_pattern, content):
-            interfaces.append({
+        for match in _source_matches(_JAVA_INTERFACE_PATTERN, code, content, 'interface'):
+            yield {
                 'name': match.group(1),
-                'line_number': content[:match.start()].count('\n') + 1,
+                'line_number': line_index.line_of(match.start()),
                 'extends': [e.strip() for e in match.group(2).split(',')] if match.group(2) else [],
                 'methods': [],
                 'file_path': file_path
-            })
-        
-        return interfaces
+            }
     
-    def _extract_enums(self, content: str, file_path: str) -> List[Dict]:
+    def _extract_enums(self, content: str, code: str, file_path: str, line_index: _LineIndex) -> Iterator[Dict]:
         """提取枚举定义"""
-        enums = []
-        
-        enum_pattern = r'(?:public\s+)?enum\s+(\w+)(?:\s+implements\s+([^{]+))?\{'
-        for match in re.finditer(enum_pattern, content):
-            enums.append({
+        for match in _source_matches(_JAVA_ENUM_PATTERN, code, content, 'enum'):
+            yield {
                 'name': match.group(1),
-                'line_number': content[:match.start()].count('\n') + 1,
+                'line_number': line_index.line_of(match.start()),
                 'interfaces': [i.strip() for i in match.group(2).split(',')] if match.group(2) else [],
                 'values': self._extract_enum_values(match.group(0)),
                 'file_path': file_path
-            })
-        
-        return enums
+            }
     
     def _extract_enum_values(self, enum_body: str) -> List[str]:
         """提取枚举值"""
         values = []
-        value_pattern = r'(\w+)(?:\([^)]*\))?(?:,|\s*\}'
-        for match in re.finditer(value_pattern, enum_body):
+        for match in _JAVA_ENUM_VALUE_PATTERN.finditer(enum_body):
             val = match.group(1)
             if val not in ['enum', '{', '}']:
                 values.append(val)
         return values
     
-    def _extract_fields(self, content: str) -> List[Dict]:
+    def _extract_fields(self, content: str, code: str, line_index: _LineIndex) -> Iterator[Dict]:
         """提取字段定义"""
-        fields = []
-        
-        field_pattern = r'(?:public|private|protected)(?:\s+(?:static|final|transient|volatile))*\s+([\w.<>]+)\s+(\w+)(?:\s*=\s*([^;]+))?\s*;'
-        for match in re.finditer(field_pattern, content):
-            fields.append({
+        for match in _source_matches(_JAVA_FIELD_PATTERN, code, content):
+            yield {
                 'type': match.group(1),
                 'name': match.group(2),
                 'default': match.group(3).strip() if match.group(3) else None,
-                'line': content[:match.start()].count('\n') + 1
-            })
-        
-        return fields
+                'line': line_index.line_of(match.start())
+            }
+
+
+# C/C++ 解析用的正则表达式（模块加载时编译一次）
+_CPP_INCLUDE_PATTERN = re.compile(r'#include\s+[<"]([^>"]+)[">]')
+_CPP_NAMESPACE_PATTERN = re.compile(r'namespace\s+(\w+)\s*\{')
+_CPP_CLASS_PATTERN = re.compile(r'class\s+(\w+)(?:\s+:\s*([^{]+))?\{')
+_CPP_STRUCT_PATTERN = re.compile(r'struct\s+(\w+)(?:\s*:\s*([^{]+))?\{')
+# 开头的 \b 使匹配只从单词边界开始：在单词开头匹配失败时，从单词中间开始同样会失败，
+# 不必在长标识符的每个字符处重新尝试并回溯；控制语句关键字在匹配时即被排除
+_CPP_FUNCTION_PATTERN = re.compile(
+    r'\b(?:void|int|bool|double|float|char|auto|template\s+<[^>]+>\s+)?'
+    r'(?!(?:if|while|for|switch|class|struct)\b)(\w+)\s*\(([^)]*)\)\s*(?:const)?\s*\{'
+)
+_CPP_TEMPLATE_PATTERN = re.compile(r'template\s*<([^>]+)>\s*(?:class|struct|function)\s+(\w+)')
+# 注释、原始字符串 R"delim(...)delim"、字符串和字符字面量
+_CPP_MASK_PATTERN = re.compile(
+    r'//[^\n]*|/\*[\s\S]*?\*/|R"([^()\\\s]{0,16})\([\s\S]*?\)\1"'
+    r'|"(?:\\[\s\S]|[^"\\\n])*"|\'(?:\\[\s\S]|[^\'\\\n])*\''
+)
 
 
 class CppASTParser:
@@ -1237,54 +1956,64 @@ class CppASTParser:
             'comments': []
         }
         
+        # 所有匹配共用一份行号索引，避免每次匹配都从文件开头统计换行
+        line_index = _LineIndex(content)
+        # 屏蔽注释和字符串后再匹配声明，替换前后等长，偏移与原始内容一致
+        code = _mask_strings_and_comments(content, _CPP_MASK_PATTERN)
+        
         # 提取注释
-        result['comments'] = self._extract_comments(content)
+        result['comments'] = list(self._extract_comments(content))
         
         # 提取头文件包含
-        result['includes'] = self._extract_includes(content)
+        result['includes'] = list(self._extract_includes(content, line_index))
         
         # 提取命名空间
-        result['namespaces'] = self._extract_namespaces(content, file_path)
+        result['namespaces'] = list(self._extract_namespaces(content, code, file_path, line_index))
         
         # 提取类
-        result['classes'] = self._extract_classes(content, file_path)
+        result['classes'] = list(self._extract_classes(content, code, file_path, line_index))
         
         # 提取结构体
-        result['structs'] = self._extract_structs(content, file_path)
+        result['structs'] = list(self._extract_structs(content, code, file_path, line_index))
         
         # 提取函数
-        result['functions'] = self._extract_functions(content, file_path)
+        result['functions'] = list(self._extract_functions(content, code, file_path, line_index))
         
         # 提取模板
-        result['templates'] = self._extract_templates(content)
+        result['templates'] = list(self._extract_templates(content, code))
         
         return result
     
-    def _extract_comments(self, content: str) -> List[Dict]:
+    def _extract_comments(self, content: str) -> Iterator[Dict]:
         """提取注释"""
-        comments = []
-        lines = content.splitlines()
+        stripped_lines = list(map(str.strip, content.splitlines()))
         
         in_multiline = False
         current_comment = []
         start_line = 0
+        processed = 0
         
-        for i, line in enumerate(lines, 1):
-            stripped = line.strip()
+        # 不含'/'的行既不是单行注释，也不会开始或结束多行注释，循环只处理含'/'的行
+        for i in compress(count(1), map(contains, stripped_lines, repeat('/'))):
+            stripped = stripped_lines[i - 1]
+            if in_multiline:
+                # 跳过的行都是多行注释的中间行，按原样收集
+                current_comment.extend(stripped_lines[processed:i - 1])
+            processed = i
             
             if stripped.startswith('//'):
                 if stripped.startswith('///'):
-                    comments.append({
+                    yield {
                         'line': i,
                         'type': 'doc_comment',
                         'content': stripped[3:].strip()
-                    })
+                    }
                 else:
-                    comments.append({
+                    yield {
                         'line': i,
                         'type': 'single',
                         'content': stripped[2:].strip()
-                    })
+                    }
             
             if '/*' in stripped:
                 in_multiline = True
@@ -1296,130 +2025,109 @@ class CppASTParser:
                 if '*/' in stripped:
                     end = stripped.find('*/')
                     current_comment.append(stripped[:end].strip())
-                    comments.append({
+                    yield {
                         'line': start_line,
                         'type': 'multi',
                         'content': ' '.join(current_comment)
-                    })
+                    }
                     in_multiline = False
                     current_comment = []
                 else:
                     current_comment.append(stripped)
-        
-        return comments
     
-    def _extract_includes(self, content: str) -> List[Dict]:
+    def _extract_includes(self, content: str, line_index: _LineIndex) -> Iterator[Dict]:
         """提取头文件包含"""
-        includes = []
-        
-        include_pattern = r'#include\s+[<"]([^>"]+)[">]'
-        for match in re.finditer(include_pattern, content):
+        for match in _keyword_finditer(_CPP_INCLUDE_PATTERN, content, '#include'):
             is_system = match.group(1).startswith('<')
-            includes.append({
+            yield {
                 'header': match.group(1),
                 'type': 'system' if is_system else 'local',
-                'line': content[:match.start()].count('\n') + 1
-            })
-        
-        return includes
+                'line': line_index.line_of(match.start())
+            }
     
-    def _extract_namespaces(self, content: str, file_path: str) -> List[Dict]:
+    def _extract_namespaces(self, content: str, code: str, file_path: str, line_index: _LineIndex) -> Iterator[Dict]:
         """提取命名空间"""
-        namespaces = []
-        
-        ns_pattern = r'namespace\s+(\w+)\s*\{'
-        for match in re.finditer(ns_pattern, content):
-            namespaces.append({
+        for match in _source_matches(_CPP_NAMESPACE_PATTERN, code, content, 'namespace'):
+            yield {
                 'name': match.group(1),
-                'line_number': content[:match.start()].count('\n') + 1,
+                'line_number': line_index.line_of(match.start()),
                 'file_path': file_path
-            })
-        
-        return namespaces
+            }
     
-    def _extract_classes(self, content: str, file_path: str) -> List[Dict]:
+    def _extract_classes(self, content: str, code: str, file_path: str, line_index: _LineIndex) -> Iterator[Dict]:
         """提取类定义"""
-        classes = []
-        
-        class_pattern = r'(?:public\s+)?(?:abstract\s+)?class\s+(\w+)(?:\s+:\s*([^{]+))?\{'
-        for match in re.finditer(class_pattern, content):
-            classes.append({
+        for match in _source_matches(_CPP_CLASS_PATTERN, code, content, 'class'):
+            yield {
                 'name': match.group(1),
-                'line_number': content[:match.start()].count('\n') + 1,
+                'line_number': line_index.line_of(match.start()),
                 'base_classes': [b.strip() for b in match.group(2).split(',')] if match.group(2) else [],
                 'methods': [],
                 'file_path': file_path
-            })
-        
-        return classes
+            }
     
-    def _extract_structs(self, content: str, file_path: str) -> List[Dict]:
+    def _extract_structs(self, content: str, code: str, file_path: str, line_index: _LineIndex) -> Iterator[Dict]:
         """提取结构体定义"""
-        structs = []
-        
-        struct_pattern = r'struct\s+(\w+)(?:\s*:\s*([^{]+))?\{'
-        for match in re.finditer(struct_pattern, content):
-            structs.append({
+        for match in _source_matches(_CPP_STRUCT_PATTERN, code, content, 'struct'):
+            yield {
                 'name': match.group(1),
-                'line_number': content[:match.start()].count('\n') + 1,
+                'line_number': line_index.line_of(match.start()),
                 'base_classes': [b.strip() for b in match.group(2).split(',')] if match.group(2) else [],
                 'file_path': file_path
-            })
-        
-        return structs
+            }
     
-    def _extract_functions(self, content: str, file_path: str) -> List[Dict]:
+    def _extract_functions(self, content: str, code: str, file_path: str, line_index: _LineIndex) -> Iterator[Dict]:
         """提取函数定义"""
-        functions = []
-        
         # 普通函数声明
-        func_pattern = r'(?:void|int|bool|double|float|char|auto|auto|template\s+<[^>]+>\s+)?(\w+)\s*\(([^)]*)\)\s*(?:const)?\s*\{'
-        for match in re.finditer(func_pattern, content):
-            func_name = match.group(1)
-            # 排除类名和结构体名
-            if not func_name in ['if', 'while', 'for', 'switch', 'class', 'struct']:
-                functions.append({
-                    'name': func_name,
-                    'line_number': content[:match.start()].count('\n') + 1,
-                    'parameters': self._parse_cpp_params(match.group(2)),
-                    'file_path': file_path
-                })
-        
-        return functions
+        for match in _source_matches(_CPP_FUNCTION_PATTERN, code, content):
+            yield {
+                'name': match.group(1),
+                'line_number': line_index.line_of(match.start()),
+                'parameters': self._parse_cpp_params(match.group(2)),
+                'file_path': file_path
+            }
     
-    def _extract_templates(self, content: str) -> List[Dict]:
+    def _extract_templates(self, content: str, code: str) -> Iterator[Dict]:
         """提取模板定义"""
-        templates = []
-        
-        template_pattern = r'template\s*<([^>]+)>\s*(?:class|struct|function)\s+(\w+)'
-        for match in re.finditer(template_pattern, content):
-            templates.append({
+        for match in _source_matches(_CPP_TEMPLATE_PATTERN, code, content, 'template'):
+            yield {
                 'parameters': [p.strip() for p in match.group(1).split(',')],
                 'name': match.group(2)
-            })
-        
-        return templates
+            }
     
     def _parse_cpp_params(self, params_str: str) -> List[Dict]:
         """解析C++参数列表"""
         params = []
-        if params_str.strip():
-            for param in params_str.split(','):
-                param = param.strip()
-                parts = param.split()
-                if len(parts) >= 2:
-                    params.append({
-                        'type': ' '.join(parts[:-1]),
-                        'name': parts[-1]
-                    })
-                elif len(parts) == 1:
-                    params.append({
-                        'type': parts[0],
-                        'name': None
-                    })
+        for param in _split_params(params_str):
+            parts = param.split()
+            if len(parts) >= 2:
+                params.append({
+                    'type': ' '.join(parts[:-1]),
+                    'name': parts[-1]
+                })
+            elif len(parts) == 1:
+                params.append({
+                    'type': parts[0],
+                    'name': None
+                })
         return params
 
 
+# Go 解析用的正则表达式（模块加载时编译一次）
+_GO_PACKAGE_PATTERN = re.compile(r'^package\s+(\w+)', re.MULTILINE)
+_GO_IMPORT_PATTERN = re.compile(r'import\s+"([^"]+)"')
+_GO_IMPORT_BLOCK_PATTERN = re.compile(r'import\s*\(\s*([\s\S]*?)\s*\)')
+_GO_STRUCT_PATTERN = re.compile(r'type\s+(\w+)\s+struct\s*\{([^}]+)\}')
+_GO_INTERFACE_PATTERN = re.compile(r'type\s+(\w+)\s+interface\s*\{([^}]+)\}')
+_GO_FUNCTION_PATTERN = re.compile(r'func\s+(?:\([^)]+\)\s*)?(\w+)\s*\(([^)]*)\)(?:\s*\((\([^)]+\))\s*)?')
+_GO_VARIABLE_PATTERN = re.compile(r'var\s+(\w+)\s+(?:\[)?(?:[^\s=]+)(?:\])?\s*=\s*([^{;]+)')
+_GO_CONSTANT_PATTERN = re.compile(r'const\s+(\w+)\s*=\s*([^{;]+)')
+# 注释、原始字符串、解释型字符串和rune字面量
+_GO_MASK_PATTERN = re.compile(
+    r'//[^\n]*|/\*[\s\S]*?\*/|`[^`]*`'
+    r'|"(?:\\.|[^"\\\n])*"|\'(?:\\.|[^\'\\\n])*\''
+)
+
+
 class GoASTParser:
     """Go语言AST解析器"""
     
@@ -1446,8 +2154,13 @@ class GoASTParser:
             'comments': []
         }
         
+        # 所有匹配共用一份行号索引，避免每次匹配都从文件开头统计换行
+        line_index = _LineIndex(content)
+        # 屏蔽注释和字符串后再匹配声明，替换前后等长，偏移与原始内容一致
+        code = _mask_strings_and_comments(content, _GO_MASK_PATTERN)
+        
         # 提取包声明
-        package_match = re.search(r'^package\s+(\w+)', content, re.MULTILINE)
+        package_match = _search_line_start(_GO_PACKAGE_PATTERN, content, 'package')
         if package_match:
             result['packages'].append({
                 'name': package_match.group(1),
@@ -1455,78 +2168,63 @@ class GoASTParser:
             })
         
         # 提取注释
-        result['comments'] = self._extract_comments(content)
+        result['comments'] = list(self._extract_comments(content))
         
         # 提取导入
-        result['imports'] = self._extract_imports(content)
+        result['imports'] = list(self._extract_imports(content, line_index))
         
         # 提取结构体
-        result['structs'] = self._extract_structs(content, file_path)
+        result['structs'] = list(self._extract_structs(content, code, file_path, line_index))
         
         # 提取接口
-        result['interfaces'] = self._extract_interfaces(content, file_path)
+        result['interfaces'] = list(self._extract_interfaces(content, code, file_path, line_index))
         
         # 提取函数
-        result['functions'] = self._extract_functions(content, file_path)
+        result['functions'] = list(self._extract_functions(content, code, file_path, line_index))
         
         # 提取变量和常量
-        result['variables'] = self._extract_variables(content)
-        result['constants'] = self._extract_constants(content)
+        result['variables'] = list(self._extract_variables(content, code, line_index))
+        result['constants'] = list(self._extract_constants(content, code, line_index))
         
         return result
     
-    def _extract_comments(self, content: str) -> List[Dict]:
+    def _extract_comments(self, content: str) -> Iterator[Dict]:
         """提取注释"""
-        comments = []
-        lines = content.splitlines()
-        
-        for i, line in enumerate(lines, 1):
-            stripped = line.strip()
-            if stripped.startswith('//'):
-                is_doc = stripped.startswith('///')
-                comments.append({
-                    'line': i,
-                    'type': 'doc' if is_doc else 'comment',
-                    'content': stripped[2:].strip() if not is_doc else stripped[3:].strip()
-                })
-        
-        return comments
+        for i, _, stripped in _comment_lines(content, ('//',)):
+            is_doc = stripped.startswith('///')
+            yield {
+                'line': i,
+                'type': 'doc' if is_doc else 'comment',
+                'content': stripped[2:].strip() if not is_doc else stripped[3:].strip()
+            }
     
-    def _extract_imports(self, content: str) -> List[Dict]:
+    def _extract_imports(self, content: str, line_index: _LineIndex) -> Iterator[Dict]:
         """提取导入语句"""
-        imports = []
-        
         # 单行导入
-        import_pattern = r'import\s+"([^"]+)"'
-        for match in re.finditer(import_pattern, content):
-            imports.append({
+        for match in _keyword_finditer(_GO_IMPORT_PATTERN, content, 'import'):
+            yield {
                 'path': match.group(1),
-                'line': content[:match.start()].count('\n') + 1
-            })
+                'line': line_index.line_of(match.start())
+            }
         
         # 导入块
-        import_block_pattern = r'import\s*\(\s*([\s\S]*?)\s*\)'
-        for match in re.finditer(import_block_pattern, content):
+        for match in _keyword_finditer(_GO_IMPORT_BLOCK_PATTERN, content, 'import'):
             block = match.group(1)
             for line in block.split('\n'):
                 line = line.strip()
                 if line.startswith('"') and line.endswith('"'):
                     path = line[1:-1]
-                    imports.append({
+                    yield {
                         'path': path,
-                        'line': content[:match.start()].count('\n') + 1
-                    })
-        
-        return imports
+                        'line': line_index.line_of(match.start())
+                    }
     
-    def _extract_structs(self, content: str, file_path: str) -> List[Dict]:
+    def _extract_structs(self, content: str, code: str, file_path: str, line_index: _LineIndex) -> Iterator[Dict]:
         """提取结构体定义"""
-        structs = []
-        
-        struct_pattern = r'type\s+(\w+)\s+struct\s*\{([^}]+)\}'
-        for match in re.finditer(struct_pattern, content):
+        for match in _source_matches(_GO_STRUCT_PATTERN, code, content):
             fields = []
-            for line in match.group(2).split('\n'):
+            # 按屏蔽后的结构体体拆分字段，注释不会被当作字段
+            for line in match.code_group(2).split('\n'):
                 line = line.strip()
                 if line:
                     parts = line.split()
@@ -1536,102 +2234,94 @@ class GoASTParser:
                             'name': parts[1] if len(parts) > 1 else None
                         })
             
-            structs.append({
+            yield {
                 'name': match.group(1),
-                'line_number': content[:match.start()].count('\n') + 1,
+                'line_number': line_index.line_of(match.start()),
                 'fields': fields,
                 'file_path': file_path
-            })
-        
-        return structs
+            }
     
-    def _extract_interfaces(self, content: str, file_path: str) -> List[Dict]:
+    def _extract_interfaces(self, content: str, code: str, file_path: str, line_index: _LineIndex) -> Iterator[Dict]:
         """提取接口定义"""
-        interfaces = []
-        
-        interface_pattern = r'type\s+(\w+)\s+interface\s*\{([^}]+)\}'
-        for match in re.finditer(interface_pattern, content):
+        for match in _source_matches(_GO_INTERFACE_PATTERN, code, content):
             methods = []
-            for line in match.group(2).split('\n'):
+            for line in match.code_group(2).split('\n'):
                 line = line.strip()
                 if line:
                     methods.append(line)
             
-            interfaces.append({
+            yield {
                 'name': match.group(1),
-                'line_number': content[:match.start()].count('\n') + 1,
+                'line_number': line_index.line_of(match.start()),
                 'methods': methods,
                 'file_path': file_path
-            })
-        
-        return interfaces
+            }
     
-    def _extract_functions(self, content: str, file_path: str) -> List[Dict]:
+    def _extract_functions(self, content: str, code: str, file_path: str, line_index: _LineIndex) -> Iterator[Dict]:
         """提取函数定义"""
-        functions = []
-        
-        func_pattern = r'func\s+(?:\([^)]+\)\s*)?(\w+)\s*\(([^)]*)\)(?:\s*\((\([^)]+\))\s*)?'
-        for match in re.finditer(func_pattern, content):
+        for match in _source_matches(_GO_FUNCTION_PATTERN, code, content):
             func_name = match.group(1)
             params = self._parse_go_params(match.group(2))
             return_type = match.group(3)
             
-            functions.append({
+            yield {
                 'name': func_name,
-                'line_number': content[:match.start()].count('\n') + 1,
+                'line_number': line_index.line_of(match.start()),
                 'parameters': params,
                 'return_type': return_type.strip() if return_type else None,
                 'file_path': file_path
-            })
-        
-        return functions
+            }
     
     def _parse_go_params(self, params_str: str) -> List[Dict]:
         """解析Go参数列表"""
         params = []
-        if params_str.strip():
-            for param in params_str.split(','):
-                param = param.strip()
-                parts = param.split()
-                if len(parts) >= 2:
-                    params.append({
-                        'name': parts[0],
-                        'type': ' '.join(parts[1:])
-                    })
-                elif len(parts) == 1:
-                    params.append({
-                        'name': None,
-                        'type': parts[0]
-                    })
+        for param in _split_params(params_str):
+            parts = param.split()
+            if len(parts) >= 2:
+                params.append({
+                    'name': parts[0],
+                    'type': ' '.join(parts[1:])
+                })
+            elif len(parts) == 1:
+                params.append({
+                    'name': None,
+                    'type': parts[0]
+                })
         return params
     
-    def _extract_variables(self, content: str) -> List[Dict]:
+    def _extract_variables(self, content: str, code: str, line_index: _LineIndex) -> Iterator[Dict]:
         """提取变量定义"""
-        variables = []
-        
-        var_pattern = r'var\s+(\w+)\s+(?:\[)?(?:[^\s=]+)(?:\])?\s*=\s*([^{;]+)'
-        for match in re.finditer(var_pattern, content):
-            variables.append({
+        for match in _source_matches(_GO_VARIABLE_PATTERN, code, content):
+            yield {
                 'name': match.group(1),
                 'value': match.group(2).strip(),
-                'line': content[:match.start()].count('\n') + 1
-            })
-        
-        return variables
+                'line': line_index.line_of(match.start())
+            }
     
-    def _extract_constants(self, content: str) -> List[Dict]:
+    def _extract_constants(self, content: str, code: str, line_index: _LineIndex) -> Iterator[Dict]:
         """提取常量定义"""
-        constants = []
-        
-        const_pattern = r'const\s+(\w+)\s*=\s*([^{;]+)'
-        for match in re.finditer(const_pattern, content):
-            constants.append({
+        for match in _source_matches(_GO_CONSTANT_PATTERN, code, content, 'const'):
+            yield {
                 'name': match.group(1),
                 'value': match.group(2).strip(),
-                'line': content[:match.start()].count('\n') + 1
-            })
-        
-        return constants
+                'line': line_index.line_of(match.start())
+            }
+
+
+# Rust 解析用的正则表达式（模块加载时编译一次）
+_RUST_MODULE_PATTERN = re.compile(r'^mod\s+(\w+)', re.MULTILINE)
+_RUST_USE_PATTERN = re.compile(r'use\s+([^;]+);')
+_RUST_STRUCT_PATTERN = re.compile(r'struct\s+(\w+)(?:\s*<[^>]+>)?(?:\s*\(([^)]*)\))?(?:\s*\{([^}]*)\})?')
+_RUST_ENUM_PATTERN = re.compile(r'enum\s+(\w+)(?:\s*<[^>]+>)?\s*\{([^}]*)\}')
+_RUST_TRAIT_PATTERN = re.compile(r'trait\s+(\w+)(?:\s*:\s*([^{]+))?\s*\{')
+_RUST_FUNCTION_PATTERN = re.compile(r'fn\s+(\w+)(?:\s*<[^>]+>)?\s*\(([^)]*)\)(?:\s*->\s*([^ \{]+))?\s*\{')
+_RUST_IMPL_PATTERN = re.compile(r'impl(?:\s+<[^>]+>)?\s+(?:\w+\s+for\s+)?(\w+)\s*\{')
+# 注释、原始字符串 r#"..."#、字符串（可跨行）和字符字面量；字符字面量只含一个字符，
+# 因此不会把生命周期参数（如 &'a str）误当作字符串
+_RUST_MASK_PATTERN = re.compile(
+    r'//[^\n]*|/\*[\s\S]*?\*/|r(#*)"[\s\S]*?"\1|"(?:\\[\s\S]|[^"\\])*"'
+    r'|\'(?:\\(?:u\{[0-9a-fA-F]{1,6}\}|x[0-9a-fA-F]{2}|.)|[^\'\\\n])\''
+)
 
 
 class RustASTParser:
@@ -1660,8 +2350,13 @@ class RustASTParser:
             'comments': []
         }
         
+        # 所有匹配共用一份行号索引，避免每次匹配都从文件开头统计换行
+        line_index = _LineIndex(content)
+        # 屏蔽注释和字符串后再匹配声明，替换前后等长，偏移与原始内容一致
+        code = _mask_strings_and_comments(content, _RUST_MASK_PATTERN)
+        
         # 提取crate声明
-        crate_match = re.search(r'^mod\s+(\w+)', content, re.MULTILINE)
+        crate_match = _search_line_start(_RUST_MODULE_PATTERN, content, 'mod')
         if crate_match:
             result['crates'].append({
                 'name': crate_match.group(1),
@@ -1669,175 +2364,139 @@ class RustASTParser:
             })
         
         # 提取注释
-        result['comments'] = self._extract_comments(content)
+        result['comments'] = list(self._extract_comments(content))
         
         # 提取use声明
-        result['use_declarations'] = self._extract_use_declarations(content)
+        result['use_declarations'] = list(self._extract_use_declarations(content, line_index))
         
         # 提取结构体
-        result['structs'] = self._extract_structs(content, file_path)
+        result['structs'] = list(self._extract_structs(content, code, file_path, line_index))
         
         # 提取枚举
-        result['enums'] = self._extract_enums(content, file_path)
+        result['enums'] = list(self._extract_enums(content, code, file_path, line_index))
         
         # 提取trait
-        result['traits'] = self._extract_traits(content, file_path)
+        result['traits'] = list(self._extract_traits(content, code, file_path, line_index))
         
         # 提取函数
-        result['functions'] = self._extract_functions(content, file_path)
+        result['functions'] = list(self._extract_functions(content, code, file_path, line_index))
         
         # 提取impl块
-        result['impls'] = self._extract_impls(content, file_path)
+        result['impls'] = list(self._extract_impls(content, code, file_path, line_index))
         
         return result
     
-    def _extract_comments(self, content: str) -> List[Dict]:
+    def _extract_comments(self, content: str) -> Iterator[Dict]:
         """提取注释"""
-        comments = []
-        lines = content.splitlines()
-        
-        for i, line in enumerate(lines, 1):
-            stripped = line.strip()
-            
+        for i, _, stripped in _comment_lines(content, ('/',)):
             if stripped.startswith('//'):
                 if stripped.startswith('///'):
-                    comments.append({
+                    yield {
                         'line': i,
                         'type': 'doc_comment',
                         'content': stripped[3:].strip()
-                    })
+                    }
                 elif stripped.startswith('//!') or stripped.startswith('/*!'):
-                    comments.append({
+                    yield {
                         'line': i,
                         'type': 'inner_doc',
                         'content': stripped[3:].strip()
-                    })
+                    }
                 else:
-                    comments.append({
+                    yield {
                         'line': i,
                         'type': 'comment',
                         'content': stripped[2:].strip()
-                    })
+                    }
             
             if stripped.startswith('/*') and '*/' in stripped:
                 if stripped.startswith('/**') or stripped.startswith('/*!'):
                     start = stripped.find('*') + 1
                     end = stripped.rfind('*/')
-                    comments.append({
+                    yield {
                         'line': i,
                         'type': 'doc_comment',
                         'content': stripped[start:end].strip()
-                    })
-        
-        return comments
+                    }
     
-    def _extract_use_declarations(self, content: str) -> List[Dict]:
+    def _extract_use_declarations(self, content: str, line_index: _LineIndex) -> Iterator[Dict]:
         """提取use声明"""
-        use_decls = []
-        
-        use_pattern = r'use\s+([^;]+);'
-        for match in re.finditer(use_pattern, content):
-            use_decls.append({
+        for match in _RUST_USE_PATTERN.finditer(content):
+            yield {
                 'path': match.group(1).strip(),
-                'line': content[:match.start()].count('\n') + 1
-            })
-        
-        return use_decls
+                'line': line_index.line_of(match.start())
+            }
     
-    def _extract_structs(self, content: str, file_path: str) -> List[Dict]:
+    def _extract_structs(self, content: str, code: str, file_path: str, line_index: _LineIndex) -> Iterator[Dict]:
         """提取结构体定义"""
-        structs = []
-        
-        struct_pattern = r'(?:pub\s+)?struct\s+(\w+)(?:\s*<[^>]+>)?(?:\s*\(([^)]*)\))?(?:\s*\{([^}]*)\})?'
-        for match in re.finditer(struct_pattern, content):
+        for match in _source_matches(_RUST_STRUCT_PATTERN, code, content, 'struct'):
             fields = []
             if match.group(3):
-                for line in match.group(3).split('\n'):
-                    line = line.strip()
-                    if line:
-                        parts = line.split(':')
-                        if len(parts) >= 2:
-                            fields.append({
-                                'name': parts[0].strip(),
-                                'type': ':'.join(parts[1:]).strip()
-                            })
-            
-            structs.append({
+                # 按屏蔽后的结构体体拆分字段，注释不会被当作字段
+                for line in match.code_group(3).split('\n'):
+                    # 按第一个冒号切分出字段名与类型，不含冒号的行不是字段
+                    name, colon, field_type = line.partition(':')
+                    if colon:
+                        fields.append({
+                            'name': name.strip(),
+                            'type': field_type.strip()
+                        })
+            
+            yield {
                 'name': match.group(1),
-                'line_number': content[:match.start()].count('\n') + 1,
+                'line_number': line_index.line_of(match.start()),
                 'fields': fields,
                 'file_path': file_path
-            })
-        
-        return structs
+            }
     
-    def _extract_enums(self, content: str, file_path: str) -> List[Dict]:
+    def _extract_enums(self, content: str, code: str, file_path: str, line_index: _LineIndex) -> Iterator[Dict]:
         """提取枚举定义"""
-        enums = []
-        
-        enum_pattern = r'(?:pub\s+)?enum\s+(\w+)(?:\s*<[^>]+>)?\s*\{([^}]*)\}'
-        for match in re.finditer(enum_pattern, content):
+        for match in _source_matches(_RUST_ENUM_PATTERN, code, content, 'enum'):
             variants = []
-            for line in match.group(2).split('\n'):
+            # 注释在屏蔽后的枚举体中已是空白
+            for line in match.code_group(2).split('\n'):
                 line = line.strip()
-                if line and not line.startswith('//'):
-                    variant = line.split(',')[0].strip()
+                if line:
+                    variant = line.partition(',')[0].strip()
                     if variant:
                         variants.append(variant)
             
-            enums.append({
+            yield {
                 'name': match.group(1),
-                'line_number': content[:match.start()].count('\n') + 1,
+                'line_number': line_index.line_of(match.start()),
                 'variants': variants,
                 'file_path': file_path
-            })
-        
-        return enums
+            }
     
-    def _extract_traits(self, content: str, file_path: str) -> List[Dict]:
+    def _extract_traits(self, content: str, code: str, file_path: str, line_index: _LineIndex) -> Iterator[Dict]:
         """提取trait定义"""
-        traits = []
-        
-        trait_pattern = r'(?:pub\s+)?trait\s+(\w+)(?:\s*:\s*([^{]+))?\s*\{'
-        for match in re.finditer(trait_pattern, content):
-            traits.append({
+        for match in _source_matches(_RUST_TRAIT_PATTERN, code, content, 'trait'):
+            yield {
                 'name': match.group(1),
-                'line_number': content[:match.start()].count('\n') + 1,
+                'line_number': line_index.line_of(match.start()),
                 'bounds': [b.strip() for b in match.group(2).split(',')] if match.group(2) else [],
                 'file_path': file_path
-            })
-        
-        return traits
+            }
     
-    def _extract_functions(self, content: str, file_path: str) -> List[Dict]:
+    def _extract_functions(self, content: str, code: str, file_path: str, line_index: _LineIndex) -> Iterator[Dict]:
         """提取函数定义"""
-        functions = []
-        
-        func_pattern = r'(?:pub\s+)?fn\s+(\w+)(?:\s*<[^>]+>)?\s*\(([^)]*)\)(?:\s*->\s*([^ \{]+))?\s*\{'
-        for match in re.finditer(func_pattern, content):
-            functions.append({
+        for match in _source_matches(_RUST_FUNCTION_PATTERN, code, content):
+            yield {
                 'name': match.group(1),
-                'line_number': content[:match.start()].count('\n') + 1,
+                'line_number': line_index.line_of(match.start()),
                 'parameters': self._parse_rust_params(match.group(2)),
                 'return_type': match.group(3).strip() if match.group(3) else None,
                 'file_path': file_path
-            })
-        
-        return functions
+            }
     
-    def _extract_impls(self, content: str, file_path: str) -> List[Dict]:
+    def _extract_impls(self, content: str, code: str, file_path: str, line_index: _LineIndex) -> Iterator[Dict]:
         """提取impl块"""
-        impls = []
-        
-        impl_pattern = r'(?:pub\s+)?impl(?:\s+<[^>]+>)?\s+(?:\w+\s+for\s+)?(\w+)\s*\{'
-        for match in re.finditer(impl_pattern, content):
-            impls.append({
+        for match in _source_matches(_RUST_IMPL_PATTERN, code, content):
+            yield {
                 'target': match.group(1),
-                'line_number': content[:match.start()].count('\n') + 1,
+                'line_number': line_index.line_of(match.start()),
                 'file_path': file_path
-            })
-        
-        return impls
+            }
     
     def _parse_rust_params(self, params_str: str) -> List[Dict]:
         """解析Rust参数列表"""
@@ -1854,6 +2513,77 @@ class RustASTParser:
         return params
 
 
+# 模块职责推断：名称中包含的关键词 -> 职责描述
+_RESPONSIBILITY_PATTERNS = {
+    'controller': '处理HTTP请求和响应',
+    'service': '提供业务逻辑服务',
+    'repository': '数据访问和存储',
+    'manager': '管理和协调功能',
+    'util': '提供工具函数',
+    'handler': '处理特定事件或请求',
+    'processor': '处理数据或任务',
+    'builder': '构建复杂对象',
+    'factory': '创建对象实例',
+    'adapter': '适配不同接口',
+    'strategy': '实现策略模式',
+    'observer': '实现观察者模式',
+    'api': '提供API接口',
+    'router': '路由处理',
+    'model': '数据模型',
+    'view': '视图渲染',
+    'middleware': '中间件处理',
+    'config': '配置管理',
+    'logger': '日志记录',
+    'cache': '缓存管理'
+}
+
+# 核心功能推断：名称中包含的关键词 -> 功能描述
+_FEATURE_PATTERNS = {
+    'create': '创建功能',
+    'get': '查询功能',
+    'update': '更新功能',
+    'delete': '删除功能',
+    'list': '列表功能',
+    'add': '添加功能',
+    'remove': '移除功能',
+    'validate': '验证功能',
+    'parse': '解析功能',
+    'serialize': '序列化功能',
+    'deserialize': '反序列化功能',
+    'transform': '转换功能',
+    'convert': '转换功能',
+    'send': '发送功能',
+    'receive': '接收功能',
+    'process': '处理功能',
+    'calculate': '计算功能',
+    'generate': '生成功能'
+}
+
+
+def _match_name_patterns(names: List[str], patterns: Dict[str, str]) -> List[str]:
+    """
+    找出名称列表中出现的关键词对应的描述
+    
+    结果与"逐个名称、按模式顺序做子串匹配并去重"完全一致，但只需对拼接后的
+    文本为每个模式做一次 str.find：首次出现位置所在的名称即最先命中该模式的名称。
+    
+    Args:
+        names: 名称列表（调用方已转为小写）
+        patterns: 关键词到描述的映射
+        
+    Returns:
+        List[str]: 去重后的描述列表，按首次命中的名称及模式顺序排列
+    """
+    text = '\0'.join(names)
+    hits = []
+    for order, (pattern, desc) in enumerate(patterns.items()):
+        pos = text.find(pattern)
+        if pos >= 0:
+            hits.append((text.count('\0', 0, pos), order, desc))
+    hits.sort()
+    return list(dict.fromkeys(desc for _, _, desc in hits))
+
+
 class ModuleDetector:
     """模块边界检测器"""
     
@@ -1879,13 +2609,18 @@ class ModuleDetector:
         """
         # 按目录分组文件
         dir_to_files = defaultdict(list)
+        # 与 file_analysis_results 一一对应的所属模块名及导入的顶层模块名，分析依赖时直接复用
+        file_modules = []
+        file_dep_modules = []
         
         for file_info in file_analysis_results:
             rel_path = file_info.get('relative_path', '')
-            dir_path = os.path.dirname(rel_path) if os.path.dirname(rel_path) else ''
+            dir_path = os.path.dirname(rel_path)
             
             # 识别包/模块标识
             module_name = self._identify_module_name(file_info, dir_path)
+            file_modules.append(module_name)
+            file_dep_modules.append(self._import_top_modules(file_info.get('imports', [])))
             
             if module_name not in self.modules:
                 self.modules[module_name] = ModuleInfo(
@@ -1898,7 +2633,7 @@ class ModuleDetector:
             self.modules[module_name].elements.extend(file_info.get('elements', []))
         
         # 分析模块依赖
-        self._analyze_dependencies(file_analysis_results)
+        self._analyze_dependencies(file_modules, file_dep_modules)
         
         # 标注模块功能
         self._annotate_modules()
@@ -1917,14 +2652,15 @@ class ModuleDetector:
             str: 模块名称
         """
         file_name = file_info.get('name', '')
+        dir_name = dir_path.rpartition(os.sep)[2] if dir_path else 'root'
         
         # 检查包标识文件
         if file_name == '__init__.py':
-            return dir_path.split(os.sep)[-1] if dir_path else 'root'
+            return dir_name
         
         # 检查JavaScript包标识
         if file_name == 'package.json':
-            return dir_path.split(os.sep)[-1] if dir_path else 'root'
+            return dir_name
         
         # 检查Java模块标识
         if file_name.endswith('.java'):
@@ -1937,54 +2673,69 @@ class ModuleDetector:
                     return parts[0] if parts else 'root'
         
         # 默认使用目录名
-        return dir_path.split(os.sep)[-1] if dir_path else 'root'
+        return dir_name
     
-    def _analyze_dependencies(self, file_analysis_results: List[Dict]):
+    @staticmethod
+    def _import_top_modules(imports: List[Dict]) -> List[str]:
+        """
+        提取文件导入的顶层模块名（按首次出现顺序去重）
+        
+        Args:
+            imports: 文件的导入列表
+            
+        Returns:
+            List[str]: 顶层模块名列表
+        """
+        top_modules = {}
+        for imp in imports:
+            module = imp.get('module', '')
+            if module:
+                # 只需第一段，限制分割次数避免生成完整的分段列表
+                top_module = module.split('/', 1)[0]
+                if top_module:
+                    top_modules[top_module] = None
+        return list(top_modules)
+    
+    def _analyze_dependencies(self, file_modules: List[str], file_dep_modules: List[List[str]]):
         """
         分析模块间依赖
         
         Args:
-            file_analysis_results: 文件分析结果列表
+            file_modules: 各文件所属的模块名（由 detect_modules 识别）
+            file_dep_modules: 各文件导入的顶层模块名（由 _import_top_modules 提取）
         """
-        for file_info in file_analysis_results:
-            imports = file_info.get('imports', [])
-            
-            for imp in imports:
-                module = imp.get('module', '')
-                if module:
-                    # 提取模块名
-                    parts = module.split('/')
-                    dep_module = parts[0] if parts else None
-                    
-                    if dep_module and dep_module in self.modules:
-                        current_module = self._get_file_module(file_info)
-                        if current_module != dep_module:
-                            if dep_module not in self.modules[current_module].dependencies:
-                                self.modules[current_module].dependencies.append(dep_module)
-                            if current_module not in self.modules[dep_module].depended_by:
-                                self.modules[dep_module].depended_by.append(current_module)
-    
-    def _get_file_module(self, file_info: Dict) -> str:
-        """获取文件所属模块"""
-        rel_path = file_info.get('relative_path', '')
-        dir_path = os.path.dirname(rel_path)
-        return dir_path.split(os.sep)[-1] if dir_path else 'root'
+        # 以 dict 作有序集合去重，O(1) 判重且保持首次出现的顺序
+        dependencies = defaultdict(dict)
+        depended_by = defaultdict(dict)
+        
+        for current_module, dep_modules in zip(file_modules, file_dep_modules):
+            for dep_module in dep_modules:
+                if dep_module in self.modules and current_module != dep_module:
+                    dependencies[current_module][dep_module] = None
+                    depended_by[dep_module][current_module] = None
+        
+        # 合并回 ModuleInfo 的列表字段（输出格式保持为列表）
+        for module_name, deps in dependencies.items():
+            module = self.modules[module_name]
+            module.dependencies = list(dict.fromkeys([*module.dependencies, *deps]))
+        for module_name, users in depended_by.items():
+            module = self.modules[module_name]
+            module.depended_by = list(dict.fromkeys([*module.depended_by, *users]))
     
     def _annotate_modules(self):
         """标注模块功能"""
         for module_name, module in self.modules.items():
-            # 收集所有类名和函数名
+            # 收集所有类名和函数名（统一在此转为小写，后续匹配不再重复转换）
             class_names = []
             function_names = []
             
             for element in module.elements:
-                if hasattr(element, 'name'):
-                    name = element.name if isinstance(element, CodeElement) else element.get('name', '')
-                    if isinstance(element, CodeElement):
-                        if element.element_type == ElementType.CLASS:
-                            class_names.append(name.lower())
-                        elif element.element_type in [ElementType.FUNCTION, ElementType.METHOD]:
-                            function_names.append(name.lower())
+                if isinstance(element, CodeElement):
+                    element_type = element.element_type
+                    if element_type == ElementType.CLASS:
+                        class_names.append(element.name.lower())
+                    elif element_type in (ElementType.FUNCTION, ElementType.METHOD):
+                        function_names.append(element.name.lower())
             
             # 分析模块职责
             module.responsibility = self._analyze_responsibility(class_names, function_names)
@@ -2000,45 +2751,13 @@ class ModuleDetector:
         分析模块职责
         
         Args:
-            class_names: 类名列表
-            function_names: 函数名列表
+            class_names: 类名列表（小写）
+            function_names: 函数名列表（小写）
             
         Returns:
             str: 模块职责描述
         """
-        keywords = []
-        
-        patterns = {
-            'controller': '处理HTTP请求和响应',
-            'service': '提供业务逻辑服务',
-            'repository': '数据访问和存储',
-            'manager': '管理和协调功能',
-            'util': '提供工具函数',
-            'handler': '处理特定事件或请求',
-            'processor': '处理数据或任务',
-            'builder': '构建复杂对象',
-            'factory': '创建对象实例',
-            'adapter': '适配不同接口',
-            'strategy': '实现策略模式',
-            'observer': '实现观察者模式',
-            'api': '提供API接口',
-            'router': '路由处理',
-            'model': '数据模型',
-            'view': '视图渲染',
-            'middleware': '中间件处理',
-            'config': '配置管理',
-            'logger': '日志记录',
-            'cache': '缓存管理'
-        }
-        
-        all_names = class_names + function_names
-        
-        for name in all_names:
-            name_lower = name.lower()
-            for pattern, desc in patterns.items():
-                if pattern in name_lower:
-                    if desc not in keywords:
-                        keywords.append(desc)
+        keywords = _match_name_patterns(class_names + function_names, _RESPONSIBILITY_PATTERNS)
         
         if keywords:
             return '、'.join(keywords)
@@ -2050,43 +2769,14 @@ class ModuleDetector:
         提取核心功能列表
         
         Args:
-            function_names: 函数名列表
-            class_names: 类名列表
+            function_names: 函数名列表（小写）
+            class_names: 类名列表（小写）
             
         Returns:
             List[str]: 核心功能列表
         """
-        features = []
-        
         # 基于命名推断功能
-        feature_patterns = {
-            'create': '创建功能',
-            'get': '查询功能',
-            'update': '更新功能',
-            'delete': '删除功能',
-            'list': '列表功能',
-            'add': '添加功能',
-            'remove': '移除功能',
-            'validate': '验证功能',
-            'parse': '解析功能',
-            'serialize': '序列化功能',
-            'deserialize': '反序列化功能',
-            'transform': '转换功能',
-            'convert': '转换功能',
-            'send': '发送功能',
-            'receive': '接收功能',
-            'process': '处理功能',
-            'calculate': '计算功能',
-            'generate': '生成功能'
-        }
-        
-        all_names = function_names + class_names
-        
-        for name in all_names:
-            name_lower = name.lower()
-            for pattern, feature in feature_patterns.items():
-                if pattern in name_lower and feature not in features:
-                    features.append(feature)
+        features = _match_name_patterns(function_names + class_names, _FEATURE_PATTERNS)
         
         return features[:10]  # 限制最多10个核心功能
     
@@ -2116,6 +2806,58 @@ class ModuleDetector:
         return interfaces
 
 
+def _read_source_file(file_path: str) -> Union[str, Exception]:
+    """
+    读取单个源文件
+    
+    以二进制方式整体读取后一次性解码，省去文本模式增量解码器的开销；
+    换行符按文本模式的通用换行规则统一为 '\n'，结果与文本模式读取一致。
+    
+    Args:
+        file_path: 文件路径
+        
+    Returns:
+        Union[str, Exception]: 文件内容；读取或解码失败时返回异常对象，由调用方记录
+    """
+    try:
+        with open(file_path, 'rb') as f:
+            data = f.read()
+        content = data.decode('utf-8')
+    except (OSError, UnicodeDecodeError) as e:
+        return e
+    if b'\r' in data:
+        content = content.replace('\r\n', '\n').replace('\r', '\n')
+    return content
+
+
+def read_source_files(file_paths: List[str],
+                      max_workers: int = _READ_MAX_WORKERS) -> Iterator[Tuple[str, Union[str, Exception]]]:
+    """
+    使用线程池并发读取源文件，按输入顺序逐个产出
+    
+    调用方处理当前文件时，后续文件已在后台读取；提前读取的文件数有上限，
+    大型项目不会把所有文件内容同时载入内存。
+    
+    Args:
+        file_paths: 文件路径列表
+        max_workers: 读取线程数
+        
+    Yields:
+        Tuple[str, Union[str, Exception]]: (文件路径, 文件内容或读取异常)
+    """
+    with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
+        pending = deque()
+        for file_path in file_paths:
+            pending.append((file_path, executor.submit(_read_source_file, file_path)))
+            if len(pending) > _READ_AHEAD_FILES:
+                path, future = pending.popleft()
+                yield path, future.result()
+        
+        while pending:
+            path, future = pending.popleft()
+            yield path, future.result()
+
+
 class SourceCodeAnalyzer:
     """源代码分析器主类，整合所有解析功能"""
     
@@ -2128,7 +2870,11 @@ class SourceCodeAnalyzer:
         """
         self.config = config or {}
         self.scanner = ProjectScanner(self.config.get('scan', {}))
-        self.ast_parser = ASTParser()
+        self.cache_dir = Path(self.config['cache_dir']) if self.config.get('cache_dir') else None
+        # 一次分析中每个文件只解析一次，内存缓存不会命中，因此不启用
+        self.ast_parser = ASTParser(self.config.get('cache_dir'), memo_size=0)
+        # 解析源文件的最大进程数，None 表示使用 CPU 核数，1 表示不并行
+        self.max_workers = self.config.get('max_workers')
         self.module_detector = None
     
     def analyze(self, project_path: str) -> Dict[str, Any]:
@@ -2164,29 +2910,41 @@ class SourceCodeAnalyzer:
         # 第二阶段：解析源代码
         logger.info("阶段2：解析源代码文件")
         file_analysis_results = []
+        source_files = scan_result['source_files']
         
-        for file_info in scan_result['source_files']:
-            file_path = file_info['path']
-            language = Language(file_info['language'])
-            
-            # 读取文件内容
-            try:
-                with open(file_path, 'r', encoding='utf-8') as f:
-                    content = f.read()
-                
-                # 解析AST
-                ast_result = self.ast_parser.parse(file_path, content, language)
-                
-                if ast_result:
-                    file_analysis_results.append({
-                        'file_info': file_info,
-                        'analysis': ast_result
-                    })
+        # 修改时间和大小均未变化的文件直接复用上次的解析结果，其余文件才需读取和解析
+        file_index = self._load_file_index(project_path)
+        cached_results = []
+        for file_info in source_files:
+            entry = file_index.get(file_info['path'])
+            if entry is not None and entry[0] == file_info['mtime'] and entry[1] == file_info['size']:
+                cached_results.append(entry[2])
+            else:
+                cached_results.append(None)
+        
+        # 需要重新解析的文件交给 parse_many，文件较多时分发到多个进程并行读取和解析
+        parsed = iter(self.ast_parser.parse_many(
+            [(file_info['path'], Language(file_info['language']))
+             for file_info, cached in zip(source_files, cached_results) if cached is None],
+            self.max_workers
+        ))
+        
+        for file_info, ast_result in zip(source_files, cached_results):
+            if ast_result is None:
+                ast_result = next(parsed)
                 
-            except Exception as e:
-                logger.error(f"解析文件失败 {file_path}: {e}")
+                if isinstance(ast_result, Exception):
+                    logger.error(f"解析文件失败 {file_info['path']}: {ast_result}")
+                    continue
+            
+            if ast_result:
+                file_analysis_results.append({
+                    'file_info': file_info,
+                    'analysis': ast_result
+                })
         
         result['file_analysis'] = file_analysis_results
+        self._write_file_index(project_path, file_analysis_results)
         
         # 第三阶段：检测模块
         logger.info("阶段3：检测模块边界")
@@ -2209,6 +2967,53 @@ class SourceCodeAnalyzer:
         
         return result
     
+    def _file_index_path(self, project_path: str) -> Path:
+        """获取项目文件索引的缓存路径（按项目绝对路径区分，多个项目可共用缓存目录）"""
+        key = hashlib.sha256(os.path.abspath(project_path).encode('utf-8', 'surrogatepass')).hexdigest()
+        return self.cache_dir / f"file-index-{key[:16]}.pickle"
+    
+    def _load_file_index(self, project_path: str) -> Dict[str, Tuple[float, int, Dict]]:
+        """
+        读取上次分析保存的文件索引
+        
+        Args:
+            project_path: 项目根目录路径
+            
+        Returns:
+            Dict[str, Tuple[float, int, Dict]]: 文件路径到 (修改时间, 文件大小, 解析结果) 的映射，
+            未启用缓存或索引不可用时为空字典
+        """
+        if self.cache_dir is None:
+            return {}
+        
+        try:
+            with open(self._file_index_path(project_path), 'rb') as f:
+                version, entries = pickle.load(f)
+        except (OSError, pickle.UnpicklingError, EOFError, ValueError, TypeError):
+            return {}
+        
+        # 解析逻辑或Python版本变化后，旧索引中的结果不再可信
+        if version != (_PARSE_CACHE_VERSION, sys.version_info[:2]):
+            return {}
+        return entries
+    
+    def _write_file_index(self, project_path: str, file_analysis_results: List[Dict]):
+        """
+        保存本次分析的文件索引，只保留本次解析成功的文件
+        
+        Args:
+            project_path: 项目根目录路径
+            file_analysis_results: 本次的文件分析结果列表
+        """
+        if self.cache_dir is None:
+            return
+        
+        entries = {
+            fa['file_info']['path']: (fa['file_info']['mtime'], fa['file_info']['size'], fa['analysis'])
+            for fa in file_analysis_results
+        }
+        _write_pickle(self._file_index_path(project_path), ((_PARSE_CACHE_VERSION, sys.version_info[:2]), entries))
+    
     def _convert_to_elements(self, analysis: Dict) -> List[CodeElement]:
         """将分析结果转换为代码元素列表"""
         elements = []
@@ -2225,6 +3030,20 @@ class SourceCodeAnalyzer:
                 visibility='public'
             )
             elements.append(element)
+            
+            # 转换方法（方法只记录在所属类下，不在 functions 中重复出现）
+            for method in cls.get('methods', []):
+                elements.append(CodeElement(
+                    name=method['name'],
+                    element_type=ElementType.METHOD,
+                    file_path=method.get('file_path', ''),
+                    line_number=method.get('line_number', 0),
+                    docstring=method.get('docstring'),
+                    parameters=method.get('parameters', []),
+                    return_type=method.get('return_type'),
+                    parent=cls['name'],
+                    complexity=method.get('complexity', 1)
+                ))
         
         # 转换函数
         for func in analysis.get('functions', []):
@@ -2254,21 +3073,24 @@ class SourceCodeAnalyzer:
             'language_distribution': {},
             'complexity_distribution': {}
         }
+        language_counter = Counter()
         
         for fa in file_analysis_results:
             analysis = fa['analysis']
             metadata = analysis.get('metadata', {})
             
             stats['total_lines'] += metadata.get('code_lines', 0)
-            stats['total_classes'] += len(analysis.get('classes', []))
-            stats['total_functions'] += len(analysis.get('functions', []))
+            classes = analysis.get('classes', [])
+            stats['total_classes'] += len(classes)
+            # 函数总数包含类中的方法
+            stats['total_functions'] += len(analysis.get('functions', [])) + \
+                sum(len(cls.get('methods', [])) for cls in classes)
             stats['total_interfaces'] += len(analysis.get('interfaces', []))
             
             # 语言分布
-            lang = fa['file_info'].get('language', 'unknown')
-            stats['language_distribution'][lang] = \
-                stats['language_distribution'].get(lang, 0) + 1
+            language_counter[fa['file_info'].get('language', 'unknown')] += 1
         
+        stats['language_distribution'] = dict(language_counter)
         return stats
 
 
@@ -2305,6 +3127,8 @@ def main():
                        help='排除的目录（逗号分隔）')
     parser.add_argument('--languages', default='',
                        help='只分析特定语言（逗号分隔）')
+    parser.add_argument('--cache-dir',
+                       help='解析结果缓存目录（如 ~/.cache/code-analyzer），重复分析时跳过未修改的文件')
     parser.add_argument('-v', '--verbose', action='store_true',
                        help='显示详细输出')
     
@@ -2318,6 +3142,8 @@ def main():
     config = {}
     if args.exclude_dirs:
         config['exclude_dirs'] = args.exclude_dirs.split(',')
+    if args.cache_dir:
+        config['cache_dir'] = os.path.expanduser(args.cache_dir)
     
     analyzer = SourceCodeAnalyzer(config)
     
@@ -2327,15 +3153,19 @@ def main():
     # 输出结果
     if args.output:
         if args.format == 'json':
-            with open(args.output, 'w', encoding='utf-8') as f:
-                json.dump(result, f, ensure_ascii=False, indent=2)
+            with open(args.output, 'wb') as f:
+                ProjectScanner.dump(result, f)
         else:
             import yaml
             with open(args.output, 'w', encoding='utf-8') as f:
                 yaml.dump(result, f, allow_unicode=True)
         print(f"分析结果已保存到: {args.output}")
     else:
-        print(json.dumps(result, ensure_ascii=False, indent=2))
+        # 直接写入标准输出的底层字节流，不再解码为str后打印
+        sys.stdout.flush()
+        ProjectScanner.dump(result, sys.stdout.buffer)
+        sys.stdout.buffer.write(b'\n')
+        sys.stdout.buffer.flush()
 
 
 if __name__ == '__main__':
@@ -0,0 +1,40 @@
+"""
+source_parser 回归测试
+"""
+
+import json
+import logging
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'scripts'))
+
+import source_parser  # noqa: E402
+
+
+@pytest.fixture
+def project_with_special_constants(tmp_path):
+    """包含 bytes、Ellipsis 和复数常量的最小项目"""
+    (tmp_path / 'consts.py').write_text("X_BYTES = b'a'\nY_ELLIPSIS = ...\nZ_COMPLEX = 1j\nvalue = b'v'\n", encoding='utf-8')
+    return tmp_path
+
+
+@pytest.mark.parametrize('use_orjson', [True, False])
+def test_special_constants_are_json_serializable(project_with_special_constants, monkeypatch, use_orjson):
+    """非JSON原生类型的常量值按源码形式记录，分析结果可直接序列化"""
+    if not use_orjson:
+        monkeypatch.setattr(source_parser, 'orjson', None)
+    logging.disable(logging.CRITICAL)
+    try:
+        result = source_parser.SourceCodeAnalyzer().analyze(str(project_with_special_constants))
+    finally:
+        logging.disable(logging.NOTSET)
+    
+    data = json.loads(source_parser._json_dumps(result))
+    
+    analysis = data['file_analysis'][0]['analysis']
+    constants = {c['name']: c['value'] for c in analysis['constants']}
+    assert constants == {'X_BYTES': "b'a'", 'Y_ELLIPSIS': '...', 'Z_COMPLEX': '1j'}
+    assert [(v['name'], v['value']) for v in analysis['variables']] == [('value', "b'v'")]